@@ -10,6 +10,7 @@ from webapp import controllers, dbsql, utils as ut
 from flask_babelex import lazy_gettext as __
 
 from . import utils
+from opac_schema.v1 import models
 
 
 class JournalControllerTestCase(BaseTestCase):
@@ -530,6 +531,37 @@ class IssueControllerTestCase(BaseTestCase):
 
         self.assertIsNone(issues)
 
+    def test_get_last_issues_by_jids(self):
+        """
+        Teste da função controllers.get_last_issues_by_jids() com vários
+        periódicos, deve retornar um dicionário com o último número de cada
+        periódico.
+        """
+
+        journal1 = utils.makeOneJournal()
+        journal2 = utils.makeOneJournal()
+
+        self._make_one({'_id': '1', 'journal': journal1.id, 'year': 2016})
+        self._make_one({'_id': '2', 'journal': journal1.id, 'year': 2018})
+        self._make_one({'_id': '3', 'journal': journal2.id, 'year': 2017, 'order': '1'})
+        self._make_one({'_id': '4', 'journal': journal2.id, 'year': 2017, 'order': '2'})
+
+        last_issues = controllers.get_last_issues_by_jids([journal1.id, journal2.id])
+
+        self.assertEqual(last_issues[journal1.id].id, '2')
+        self.assertEqual(last_issues[journal2.id].id, '4')
+
+    def test_get_last_issues_by_jids_without_issues(self):
+        """
+        Teste da função controllers.get_last_issues_by_jids() com periódicos
+        sem números, deve retornar um dicionário vazio.
+        """
+
+        journal = utils.makeOneJournal()
+
+        self.assertEqual(controllers.get_last_issues_by_jids([journal.id]), {})
+        self.assertEqual(controllers.get_last_issues_by_jids([]), {})
+
     def test_get_issue_by_journal_and_assets_code_raises_error_if_no_assets_code(self):
         """
         Teste da função controllers.get_issue_by_journal_and_issue_info() com assets_code
@@ -722,6 +754,63 @@ class ArticleControllerTestCase(BaseTestCase):
         """
         self.assertIsNone(controllers.get_article_by_aid('anyjid'))
 
+    def test_get_article_by_pid_with_prefetch(self):
+        """
+        Teste da função controllers.get_article_by_pid com ``prefetch``, deve
+        retornar o artigo com o número e o periódico já carregados.
+        """
+
+        article = self._make_one({'pid': 'S0101-02022018000100001'})
+
+        result = controllers.get_article_by_pid('S0101-02022018000100001', prefetch=True)
+
+        self.assertEqual(result.id, article.id)
+        self.assertIsInstance(result._data['issue'], models.Issue)
+        self.assertIsInstance(result._data['journal'], models.Journal)
+        self.assertEqual(result.issue.id, article.issue.id)
+        self.assertEqual(result.journal.id, article.journal.id)
+
+    def test_get_article_by_pid_with_prefetch_without_article(self):
+        """
+        Teste da função controllers.get_article_by_pid com ``prefetch`` e sem
+        artigo, deve retornar None.
+        """
+        self.assertIsNone(controllers.get_article_by_pid('anypid', prefetch=True))
+
+    def test_get_article_detail_bundle(self):
+        """
+        Teste da função controllers.get_article_detail_bundle, deve retornar o
+        artigo, o número e o periódico, com as referências do artigo já
+        carregadas.
+        """
+
+        journal = utils.makeOneJournal({'url_segment': 'journal_seg'})
+        issue = utils.makeOneIssue({'journal': journal, 'url_segment': 'issue_seg'})
+        article = self._make_one({
+            'issue': issue, 'journal': journal, 'url_segment': 'article_seg'})
+
+        result, result_issue, result_journal = controllers.get_article_detail_bundle(
+            'journal_seg', 'issue_seg', 'article_seg')
+
+        self.assertEqual(result.id, article.id)
+        self.assertEqual(result_issue.id, issue.id)
+        self.assertEqual(result_journal.id, journal.id)
+        self.assertIs(result.issue, result_issue)
+        self.assertIs(result.journal, result_journal)
+        self.assertIs(result_issue.journal, result_journal)
+
+    def test_get_article_detail_bundle_without_issue(self):
+        """
+        Teste da função controllers.get_article_detail_bundle sem número, deve
+        retornar (None, None, None).
+        """
+
+        utils.makeOneJournal({'url_segment': 'journal_seg'})
+
+        self.assertEqual(
+            controllers.get_article_detail_bundle('journal_seg', 'issue_seg', 'article_seg'),
+            (None, None, None))
+
     def test_get_articles_by_aid(self):
         """
         Testando a função controllers.get_articles_by_aid() deve retornar uma
@@ -842,6 +931,62 @@ class ArticleControllerTestCase(BaseTestCase):
 
         self.assertListEqual(articles, expected)
 
+    def test_get_articles_by_iid_with_only(self):
+        """
+        Testando a função controllers.get_articles_by_iid() com a chave
+        ``only``, deve carregar apenas os campos indicados.
+        """
+
+        self._make_one(attrib={
+            '_id': '012ijs9y24',
+            'issue': '90210j83',
+            'order': '14',
+            'journal': 'oak,ajimn1',
+            'url_segment': 'url-seg-1',
+        })
+
+        articles = controllers.get_articles_by_iid('90210j83', only=('order', 'publication_date', 'aop_pid'))
+
+        self.assertEqual(articles[0].id, '012ijs9y24')
+        self.assertIsNone(articles[0].url_segment)
+
+    def test_get_articles_by_issues(self):
+        """
+        Testando a função controllers.get_articles_by_issues(), deve retorna
+        um dicionário com as listas de artigos de cada número.
+        """
+
+        issue1 = utils.makeOneIssue({'_id': '90210j83'})
+        issue2 = utils.makeOneIssue({'_id': '90210j82'})
+
+        self._make_one(attrib={
+            '_id': '012ijs9y24',
+            'issue': issue1.id,
+            'order': '14',
+            'journal': issue1.journal.id
+        })
+        self._make_one(attrib={
+            '_id': '2183ikos90',
+            'issue': issue1.id,
+            'order': '12',
+            'journal': issue1.journal.id
+        })
+        self._make_one(attrib={
+            '_id': '9298wjso89',
+            'issue': issue2.id,
+            'order': '13',
+            'journal': issue2.journal.id
+        })
+
+        articles = controllers.get_articles_by_issues([issue1, issue2])
+
+        self.assertListEqual(
+            [article.id for article in articles[issue1.id]],
+            ['2183ikos90', '012ijs9y24'])
+        self.assertListEqual(
+            [article.id for article in articles[issue2.id]],
+            ['9298wjso89'])
+
     def test_get_articles_by_iid_from_aop_issue(self):
         """
         Testando a função controllers.get_articles_by_iid(), deve retorna uma
@@ -1035,6 +1180,26 @@ class ArticleControllerTestCase(BaseTestCase):
         self.assertEqual(article._id, '012ijs9y24')
         self.assertEqual(article.scielo_pids["v1"], 'S0101-0202(99)12345')
 
+    def test_get_article_by_scielo_pid_with_prefetch(self):
+        """
+        Testando a função controllers.get_article_by_scielo_pid() com
+        ``prefetch``, retorna o artigo com o número e o periódico já carregados.
+        """
+        article = self._make_one(attrib={
+            'scielo_pids': {
+                'v1': 'S0101-0202(99)12345',
+                'v2': 'S0101-02021998123456',
+                'v3': 'cS2o3kdx93emd902m',
+            },
+        })
+        result = controllers.get_article_by_scielo_pid("S0101-02021998123456", prefetch=True)
+
+        self.assertEqual(result.id, article.id)
+        self.assertIsInstance(result._data['issue'], models.Issue)
+        self.assertIsInstance(result._data['journal'], models.Journal)
+        self.assertEqual(result.issue.id, article.issue.id)
+        self.assertEqual(result.journal.id, article.journal.id)
+
     def test_get_recent_articles_of_issue(self):
         self._make_one(attrib={
             '_id': '012ijs9y24',
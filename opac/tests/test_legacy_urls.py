@@ -108,7 +108,7 @@ class LegacyURLTestCase(BaseTestCase):
 
                 self.assertTemplateUsed('article/detail.html')
 
-    @patch('requests.get')
+    @patch('webapp.main.views._SESSION.get')
     def test_router_legacy_pdf(self, mocked_requests_get):
         """
         Testa o acesso à URL antiga do PDF quando existe a chave filename no campo pdf.
@@ -119,6 +119,8 @@ class LegacyURLTestCase(BaseTestCase):
         mocked_response = Mock()
         mocked_response.status_code = 200
         mocked_response.content = b'<pdf>'
+        mocked_response.headers = {'Content-Length': '5'}
+        mocked_response.raw.stream.return_value = iter([b'<pdf>'])
         mocked_requests_get.return_value = mocked_response
 
         with current_app.app_context():
@@ -150,6 +152,60 @@ class LegacyURLTestCase(BaseTestCase):
                 response = c.get(url, follow_redirects=True)
 
                 self.assertStatus(response, 200)
+                self.assertEqual(response.data, b'<pdf>')
+
+    @patch('webapp.main.views._SESSION.get')
+    def test_router_legacy_pdf_upstream_gzip(self, mocked_requests_get):
+        """
+        Testa o acesso à URL antiga do PDF quando o SSM responde com
+        ``Content-Encoding: gzip``, o cliente não deve receber o conteúdo
+        comprimido sem solicitá-lo.
+        URL testada: /pdf/<JOURNAL_ACRON>/<ISSUE_LABEL>/<PDF_FILENAME>
+        """
+
+        mocked_response = Mock()
+        mocked_response.status_code = 200
+        mocked_response.headers = {'Content-Length': '25', 'Content-Encoding': 'gzip'}
+        mocked_response.raw.stream.return_value = iter([b'<pdf>'])
+        mocked_requests_get.return_value = mocked_response
+
+        with current_app.app_context():
+
+            journal = utils.makeOneJournal({'print_issn': '0000-0000', 'acronym': 'cta'},)
+
+            issue = utils.makeOneIssue({
+                'journal': journal.id,
+                'label': 'v39s2',
+            })
+
+            utils.makeOneArticle({
+                'journal': journal.id,
+                'issue': issue.id,
+                'pdfs': [
+                    {
+                        'lang': 'en',
+                        'url': 'http://minio:9000/documentstore/1678-457X/JDH74Jr4SyDVpnkMyrqkDhF/e5e09c7d5e4e5052868372df837de4e1ee9d651a.pdf',
+                        'file_path': '/pdf/cta/v39s2/0101-2061-cta-fst30618.pdf',
+                        'type': 'pdf'
+                    }
+                ]
+            })
+
+            with self.client as c:
+
+                url = '/pdf/cta/v39s2/0101-2061-cta-fst30618.pdf'
+
+                response = c.get(url, follow_redirects=True)
+
+                self.assertStatus(response, 200)
+                self.assertIsNone(response.headers.get('Content-Encoding'))
+                self.assertNotEqual(response.headers.get('Content-Length'), '25')
+                self.assertEqual(response.data, b'<pdf>')
+                self.assertEqual(
+                    mocked_requests_get.call_args[1]['headers'],
+                    {'Accept-Encoding': 'identity'})
+                mocked_response.raw.stream.assert_called_once_with(
+                    64 * 1024, decode_content=True)
 
     def test_article_text_with_lng(self):
         """
@@ -1,4 +1,5 @@
 # coding: utf-8
+import gzip
 import unittest
 from unittest.mock import patch, Mock
 
@@ -11,6 +12,7 @@ from .base import BaseTestCase
 
 from . import utils
 from webapp.config.lang_names import display_original_lang_name
+from webapp.main import views
 
 
 class MainTestCase(BaseTestCase):
@@ -393,6 +395,70 @@ class MainTestCase(BaseTestCase):
             self.assertTemplateUsed('issue/feed_content.html')
             self.assertIn('Vol. 10 No. 31', response.data.decode('utf-8'))
 
+    def test_issue_feed_article_without_language(self):
+        """
+        Teste da ``view function`` ``issue_feed`` com artigo sem
+        ``original_language`` e sem o idioma do feed, deve retornar a URL do
+        artigo sem o código de idioma.
+        """
+
+        with current_app.app_context():
+            utils.makeOneCollection()
+
+            journal = utils.makeOneJournal()
+
+            issue = utils.makeOneIssue({'journal': journal})
+
+            article = utils.makeOneArticle({'title': 'Article Y',
+                                            'original_language': None,
+                                            'languages': [],
+                                            'issue': issue,
+                                            'journal': journal,
+                                            'url_segment': '10-11'})
+
+            response = self.client.get(url_for('main.issue_feed',
+                                       url_seg=journal.url_segment,
+                                       url_seg_issue=issue.url_segment))
+
+            self.assertStatus(response, 200)
+            self.assertIn(
+                url_for('main.article_detail',
+                        url_seg=journal.url_segment,
+                        url_seg_issue=issue.url_segment,
+                        url_seg_article=article.url_segment),
+                response.data.decode('utf-8'))
+
+    def test_issue_feed_not_modified(self):
+        """
+        Teste da ``view function`` ``issue_feed`` com o cabeçalho
+        ``If-None-Match`` igual ao ETag da resposta anterior, deve retornar
+        304.
+        """
+
+        with current_app.app_context():
+            utils.makeOneCollection()
+
+            journal = utils.makeOneJournal()
+
+            issue = utils.makeOneIssue({'journal': journal})
+            utils.makeAnyArticle(
+                issue=issue,
+                attrib={'journal': issue.journal.id, 'issue': issue.id}
+            )
+
+            url = url_for('main.issue_feed',
+                          url_seg=journal.url_segment,
+                          url_seg_issue=issue.url_segment)
+
+            response = self.client.get(url)
+            self.assertStatus(response, 200)
+            self.assertIsNotNone(response.headers.get('ETag'))
+            self.assertIn('private', response.headers.get('Cache-Control'))
+
+            response = self.client.get(
+                url, headers={'If-None-Match': response.headers['ETag']})
+            self.assertStatus(response, 304)
+
     def test_issue_feed_has_doi(self):
         """
         Teste da ``view function`` ``issue_feed``, deve retornar um rss
@@ -533,6 +599,97 @@ class MainTestCase(BaseTestCase):
                 content
             )
 
+    def test_article_detail_gzip(self):
+        """
+        Teste da ``view function`` ``article_detail`` com o cabeçalho
+        ``Accept-Encoding: gzip``, deve retornar a página comprimida com gzip.
+        """
+        with current_app.app_context():
+
+            utils.makeOneCollection()
+
+            journal = utils.makeOneJournal()
+
+            issue = utils.makeOneIssue({'journal': journal})
+
+            article = utils.makeOneArticle({'title': 'Article Y',
+                                            'original_language': 'en',
+                                            'languages': ['es', 'pt'],
+                                            'issue': issue,
+                                            'journal': journal,
+                                            'url_segment': '10-11'})
+
+            url = url_for('main.article_detail',
+                          url_seg=journal.url_segment,
+                          url_seg_issue=issue.url_segment,
+                          url_seg_article=article.url_segment,
+                          lang_code='en')
+
+            response = self.client.get(url, headers={'Accept-Encoding': 'gzip'})
+
+            self.assertStatus(response, 200)
+            self.assertEqual(response.headers.get('Content-Encoding'), 'gzip')
+            self.assertIn('Accept-Encoding', response.headers.get('Vary'))
+            self.assertIn(
+                '<meta name="citation_title" content="Article Y"></meta>',
+                gzip.decompress(response.data).decode('utf-8')
+            )
+
+    def test_article_detail_gzip_with_minify_page(self):
+        """
+        Teste da ``view function`` ``article_detail`` com ``MINIFY_PAGE``
+        ativo, com e sem cache, o corpo comprimido com gzip deve ser igual à
+        página minificada entregue sem compressão.
+        """
+        from flask_htmlmin import HTMLMIN
+
+        htmlmin = HTMLMIN()
+        after_request_funcs = current_app.after_request_funcs.setdefault(None, [])
+        # como em ``create_app``: o HTMLMIN é registrado depois do send_gzip_body
+        after_request_funcs.append(htmlmin.response_minify)
+        try:
+            with current_app.app_context(), \
+                    patch.dict(current_app.config, {'MINIFY_PAGE': True}), \
+                    patch.dict(current_app.extensions, {'htmlmin': htmlmin}):
+
+                utils.makeOneCollection()
+
+                journal = utils.makeOneJournal()
+
+                issue = utils.makeOneIssue({'journal': journal})
+
+                article = utils.makeOneArticle({'title': 'Article Y',
+                                                'original_language': 'en',
+                                                'languages': ['es', 'pt'],
+                                                'issue': issue,
+                                                'journal': journal,
+                                                'url_segment': '10-11'})
+
+                url = url_for('main.article_detail',
+                              url_seg=journal.url_segment,
+                              url_seg_issue=issue.url_segment,
+                              url_seg_article=article.url_segment,
+                              lang_code='en')
+
+                # sem cache a compressão é feita no envio, com cache o corpo
+                # comprimido é calculado pela view
+                for cache_enabled in (False, True):
+                    with self.subTest(cache_enabled=cache_enabled), \
+                            patch.dict(current_app.config, {'CACHE_ENABLED': cache_enabled}):
+
+                        response = self.client.get(url, headers={'Accept-Encoding': 'gzip'})
+
+                        self.assertStatus(response, 200)
+                        self.assertEqual(response.headers.get('Content-Encoding'), 'gzip')
+
+                        plain_response = self.client.get(url)
+
+                        self.assertStatus(plain_response, 200)
+                        self.assertIsNone(plain_response.headers.get('Content-Encoding'))
+                        self.assertEqual(gzip.decompress(response.data), plain_response.data)
+        finally:
+            after_request_funcs.remove(htmlmin.response_minify)
+
     def test_article_detail_redirects_to_original_language(self):
         """
         Teste da ``view function`` ``article_detail``, deve retornar uma página
@@ -618,7 +775,7 @@ class MainTestCase(BaseTestCase):
             self.assertEqual(self.get_context_variable('journal').id, article.journal.id)
             self.assertEqual(self.get_context_variable('issue').id, article.issue.id)
 
-    @patch('requests.get')
+    @patch('webapp.main.views._SESSION.get')
     def test_article_detail_translate_version_(self, mocked_requests_get):
         """
         Teste da ``view function`` ``article_detail``, deve retornar uma página
@@ -676,7 +833,7 @@ class MainTestCase(BaseTestCase):
             self.assertEqual(
                 content.count('{}">bla<'.format(urls['bla'])), 1)
 
-    @patch('requests.get')
+    @patch('webapp.main.views._SESSION.get')
     def test_article_detail_has_citation_title_in_pt(self, mocked_requests_get):
         """
         Teste da ``view function`` ``article_detail``, deve retornar uma página
@@ -732,7 +889,7 @@ class MainTestCase(BaseTestCase):
                 content
             )
 
-    @patch('requests.get')
+    @patch('webapp.main.views._SESSION.get')
     def test_article_detail_has_citation_title_in_es(self, mocked_requests_get):
         """
         Teste da ``view function`` ``article_detail``, deve retornar uma página
@@ -1575,6 +1732,36 @@ class TestJournaDetail(BaseTestCase):
                           response.data.decode('utf-8'))
             self.assertEqual(self.get_context_variable('journal').id, journal.id)
 
+    def test_journal_detail_not_modified(self):
+        """
+        Teste da ``view function`` ``journal_detail``, deve retornar a página
+        com ETag, ``Cache-Control: private, max-age`` e ``Vary`` com
+        ``Accept-Language`` e ``Cookie``, e 304 quando o cabeçalho
+        ``If-None-Match`` é igual ao ETag da resposta anterior.
+        """
+
+        with current_app.app_context():
+
+            utils.makeOneCollection()
+
+            journal = utils.makeOneJournal({'title': 'Revista X'})
+
+            url = url_for('main.journal_detail', url_seg=journal.url_segment)
+
+            response = self.client.get(url)
+
+            self.assertStatus(response, 200)
+            self.assertIsNotNone(response.headers.get('ETag'))
+            self.assertTrue(response.cache_control.private)
+            self.assertEqual(response.cache_control.max_age,
+                             views.CONDITIONAL_GET_MAX_AGE)
+            self.assertIn('Accept-Language', response.vary)
+            self.assertIn('Cookie', response.vary)
+
+            response = self.client.get(
+                url, headers={'If-None-Match': response.headers['ETag']})
+            self.assertStatus(response, 304)
+
     def test_journal_detail_legacy_url(self):
         """
         Teste da ``view function`` ``journal_detail_legacy_url``, deve retorna status_code 301
@@ -5,7 +5,7 @@ from unittest.mock import Mock, patch
 
 from . import utils
 
-from webapp import utils as wutils
+from webapp import controllers, utils as wutils
 import webapp
 
 
@@ -211,6 +211,26 @@ class UtilsTestCase(BaseTestCase):
 
         self.assertIsNone(prev_article)
 
+    def test_get_prev_and_next_article_with_projection(self):
+        """
+        Teste das funções utils.get_prev_article() e utils.get_next_article()
+        com uma lista de artigos carregados parcialmente (projeção).
+        """
+
+        issue = utils.makeOneIssue()
+        article1 = utils.makeOneArticle({'order': '1', 'issue': issue})
+        article2 = utils.makeOneArticle({'order': '2', 'issue': issue})
+        article3 = utils.makeOneArticle({'order': '3', 'issue': issue})
+
+        articles = list(
+            controllers.get_articles_by_iid(
+                issue.iid, only=('url_segment', 'order')))
+
+        self.assertEqual(
+            wutils.get_prev_article(articles, article2).pk, article1.pk)
+        self.assertEqual(
+            wutils.get_next_article(articles, article2).pk, article3.pk)
+
     def test_join_html_files_content(self):
         files = ['paboutj.htm', 'pedboard.htm', 'pinstruc.htm']
         content = wutils.join_html_files_content(
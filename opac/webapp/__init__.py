@@ -142,13 +142,20 @@ def create_app():
     login_manager.login_view = 'admin.login_view'
     login_manager.init_app(app)
 
+    # Corpo pré-comprimido (gzip) das respostas em cache; registrado antes do
+    # HTMLMIN para ser executado depois da minificação
+    from .main.views import send_gzip_body
+    app.after_request(send_gzip_body)
+
     # Minificando o HTML
     if not app.config['DEBUG']:
-        HTMLMIN(app)
+        app.extensions['htmlmin'] = HTMLMIN(app)
 
     # Registrando os filtros
     app.jinja_env.filters['trans_alpha2'] = custom_filters.trans_alpha2
     app.jinja_env.filters['datetimefilter'] = custom_filters.datetimefilter
+    app.jinja_env.filters['text_langs'] = custom_filters.text_langs
+    app.jinja_env.filters['pdf_langs'] = custom_filters.pdf_langs
 
     # i18n
     babel.init_app(app)
@@ -59,6 +59,7 @@ import os
         - OPAC_MEDIA_ROOT:      path absoluto da pasta que vai armazenar as imagens subidas pelos usuários pelo admin.
                                 (default: /[repo dir]/opac/opac/webapp/media/)
         - OPAC_MEDIA_URL:       URL para servir as imagens. (default: '/media')
+        - OPAC_USE_X_SENDFILE:  delega o envio dos arquivos ao servidor web (nginx/apache) com o cabeçalho X-Sendfile. (default: False)
 
       - Extensions:
         - FILES_ALLOWED_EXTENSIONS:  extensão dos arquivos permitidos para upload
@@ -298,6 +299,7 @@ MEDIA_ROOT = os.environ.get('OPAC_MEDIA_ROOT', DEFAULT_MEDIA_ROOT)
 IMAGE_ROOT = os.path.join(MEDIA_ROOT, 'images')
 FILE_ROOT = os.path.join(MEDIA_ROOT, 'files')
 MEDIA_URL = os.environ.get('OPAC_MEDIA_URL', '/media')
+USE_X_SENDFILE = os.environ.get('OPAC_USE_X_SENDFILE', 'False') == 'True'
 
 # extensions
 FILES_ALLOWED_EXTENSIONS = ('txt', 'pdf', 'csv', 'xls', 'doc', 'ppt', 'xlsx', 'docx', 'pptx', 'html', 'htm')
@@ -1,4 +1,5 @@
 # coding=utf-8
+from functools import lru_cache
 
 # Source: https://en.wikipedia.org/wiki/List_of_ISO_639-1_codes, 10 Dec 2018
 # Pares são (nome original, nome ISO)
@@ -195,6 +196,7 @@ def get_original_lang_name(code):
     return LANG_NAMES.get(code, (None, code))[0]
 
 
+@lru_cache(maxsize=256)
 def display_original_lang_name(code):
     name = get_original_lang_name(code)
     if name is None:
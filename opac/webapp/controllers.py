@@ -29,7 +29,7 @@ from flask import current_app, url_for
 from flask_babelex import gettext as _
 from flask_babelex import lazy_gettext as __
 from flask_mongoengine import Pagination
-from webapp import dbsql
+from webapp import dbsql, cache
 from .models import User
 from .choices import INDEX_NAME, JOURNAL_STATUS, STUDY_AREAS
 from .utils import utils
@@ -50,12 +50,20 @@ HIGHLIGHTED_TYPES = (
 
 # -------- COLLECTION --------
 
+# Tempo (em segundos) que a coleção corrente é mantida no cache
+CURRENT_COLLECTION_CACHE_TIMEOUT = 300
+
+
+@cache.memoize(timeout=CURRENT_COLLECTION_CACHE_TIMEOUT)
 def get_current_collection():
     """
     Retorna o objeto coleção filtrando pela coleção cadastrada no arquivo de
     configuração ``OPAC_COLLECTION`` e atualiza com os dados da coleção já no site.
     Isso se mantém ainda para coletar as citações que não são possíveis extrair dos
     dados já presentes no site.
+
+    O resultado é mantido no cache por ``CURRENT_COLLECTION_CACHE_TIMEOUT``
+    segundos, já que a coleção e os seus totais mudam pouco.
     """
     current_collection_acronym = current_app.config['OPAC_COLLECTION']
     collection = Collection.objects.get(acronym=current_collection_acronym)
@@ -387,13 +395,14 @@ def get_journal_generator_for_csv(list_type='alpha', title_query='', is_public=T
 
         for journal in journals:
             csv_writer.writerow(format_csv_row(list_type, journal))
-        csv_file.seek(0)
 
         return csv_file.getvalue()
     else:
         output = io.BytesIO()
 
-        workbook = xlsxwriter.Workbook(output, {'in_memory': True})
+        # ``constant_memory``: as linhas são descarregadas em disco à medida
+        # que são escritas, em vez de manter toda a planilha em memória.
+        workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
 
         worksheet = workbook.add_worksheet(worksheet_name)
         worksheet.set_column('A:A', 50)
@@ -418,9 +427,7 @@ def get_journal_generator_for_csv(list_type='alpha', title_query='', is_public=T
 
         workbook.close()
 
-        output.seek(0)
-
-        return output.read()
+        return output.getvalue()
 
 
 def get_journal_by_jid(jid, **kwargs):
@@ -566,6 +573,47 @@ def get_issues_by_jid(jid, **kwargs):
         return Issue.objects(journal=jid, **kwargs).order_by(*order_by)
 
 
+def get_last_issues_by_jids(jids, **kwargs):
+    """
+    Retorna um dicionário com o último número de cada periódico cujo ``_id``
+    pertence a lista do parâmetro ``jids``, utilizando a mesma ordenação de
+    ``get_issues_by_jid``: "-year", "-volume", "-order".
+
+    - ``jids``: lista de ids de periódicos;
+    - ``kwargs``: parâmetros de filtragem.
+
+    A seleção do último número é feita no MongoDB (uma agregação e uma busca
+    em lote) evitando uma consulta por periódico.
+
+    Em caso de não existir itens retorna {}.
+
+    Exemplo do retorno:
+        {
+            u'jid1': <Issue: issue-iid1>,
+            u'jid2': <Issue: issue-iid2>,
+        }
+    """
+
+    if not jids:
+        return {}
+
+    pipeline = (
+        {'$sort': OrderedDict([('year', -1), ('volume', -1), ('order', -1)])},
+        {'$group': {'_id': '$journal', 'iid': {'$first': '$_id'}}},
+    )
+    last_iids = {
+        group['_id']: group['iid']
+        for group in Issue.objects(journal__in=jids, **kwargs).aggregate(*pipeline)
+    }
+    issues_by_iid = Issue.objects.in_bulk(list(last_iids.values()))
+
+    return {
+        jid: issues_by_iid[iid]
+        for jid, iid in last_iids.items()
+        if iid in issues_by_iid
+    }
+
+
 def get_issues_for_grid_by_jid(jid, **kwargs):
     """
     Retorna uma lista de números considerando os parâmetros ``jid`` e ``kwargs``,
@@ -729,7 +777,14 @@ def get_issue_by_url_seg(url_seg, url_seg_issue):
     if not url_seg and url_seg_issue:
         raise ValueError(__('Obrigatório um url_seg e url_seg_issue.'))
 
-    return Issue.objects.filter(journal=journal, url_segment=url_seg_issue, type__ne='pressrelease').first()
+    issue = Issue.objects.filter(journal=journal, url_segment=url_seg_issue, type__ne='pressrelease').first()
+
+    if issue and journal:
+        # reaproveita o periódico já carregado como referência do número,
+        # atribuição direta em ``_data`` para não marcar o campo como alterado
+        issue._data['journal'] = journal
+
+    return issue
 
 
 def get_issue_info_from_assets_code(assets_code, journal):
@@ -793,22 +848,64 @@ def get_article_by_url_seg(url_seg_article, **kwargs):
     return Article.objects(url_segment=url_seg_article, **kwargs).first()
 
 
-def get_article_by_issue_article_seg(iid, url_seg_article, **kwargs):
+def get_article_by_issue_article_seg(iid, url_seg_article, prefetch=False, **kwargs):
     """
     Retorna um artigo considerando os parâmetros ``iid``, ``url_seg_article`` e
     ``kwargs``.
 
     - ``iid``: string, id do número;
     - ``url_seg_article``: string, segmento do url do artigo;
+    - ``prefetch``: boolean, carrega o número e o periódico do artigo na mesma
+    consulta (ver ``get_first_article_with_references``);
     - ``kwargs``: parâmetros de filtragem.
     """
     if not iid and url_seg_article:
         raise ValueError(__('Obrigatório um iid and url_seg_article.'))
 
-    return Article.objects(issue=iid, url_segment=url_seg_article, **kwargs).first()
+    articles = Article.objects(issue=iid, url_segment=url_seg_article, **kwargs)
+    if prefetch:
+        return get_first_article_with_references(articles)
+    return articles.first()
+
+
+def get_article_detail_bundle(url_seg, url_seg_issue, url_seg_article, **kwargs):
+    """
+    Retorna a tupla ``(article, issue, journal)`` considerando os segmentos de
+    URL do periódico, do número e do artigo.
+
+    - ``url_seg``: string, segmento do url do periódico;
+    - ``url_seg_issue``: string, segmento do url do número;
+    - ``url_seg_article``: string, segmento do url do artigo;
+    - ``kwargs``: parâmetros de filtragem do artigo.
+
+    O número e o periódico já carregados são atribuídos como referências do
+    artigo (``article.issue`` e ``article.journal``), evitando uma consulta ao
+    banco para cada referência acessada.
+
+    Em caso de não existir o número retorna ``(None, None, None)`` e, em caso
+    de não existir o artigo, ``(None, issue, journal)``.
+    """
+
+    issue = get_issue_by_url_seg(url_seg, url_seg_issue)
+
+    if not issue:
+        return None, None, None
+
+    journal = issue.journal
+    article = get_article_by_issue_article_seg(issue.iid, url_seg_article, **kwargs)
+
+    if article:
+        # atribuição direta em ``_data`` para não marcar os campos como
+        # alterados
+        article._data['issue'] = issue
+        journal_ref = article._data.get('journal')
+        if journal and getattr(journal_ref, 'id', journal_ref) == journal.id:
+            article._data['journal'] = journal
 
+    return article, issue, journal
 
-def get_article_by_aop_url_segs(jid, url_seg_issue, url_seg_article, **kwargs):
+
+def get_article_by_aop_url_segs(jid, url_seg_issue, url_seg_article, prefetch=False, **kwargs):
     """
     Retorna um artigo considerando os parâmetros ``jid``, ``url_seg_issue``,
     ``url_seg_article`` e ``kwargs``.
@@ -816,6 +913,8 @@ def get_article_by_aop_url_segs(jid, url_seg_issue, url_seg_article, **kwargs):
     - ``jid``: string, id do journal;
     - ``url_seg_issue``: string, segmento do url do fascículo;
     - ``url_seg_article``: string, segmento do url do artigo;
+    - ``prefetch``: boolean, carrega o número e o periódico do artigo na mesma
+    consulta (ver ``get_first_article_with_references``);
     - ``kwargs``: parâmetros de filtragem.
     """
     if not (jid and url_seg_issue and url_seg_article):
@@ -826,7 +925,10 @@ def get_article_by_aop_url_segs(jid, url_seg_issue, url_seg_article, **kwargs):
         "url_seg_issue": url_seg_issue
     }
 
-    return Article.objects(journal=jid, aop_url_segs=aop_url_segs, **kwargs).first()
+    articles = Article.objects(journal=jid, aop_url_segs=aop_url_segs, **kwargs)
+    if prefetch:
+        return get_first_article_with_references(articles)
+    return articles.first()
 
 
 def get_articles_by_aid(aids):
@@ -875,7 +977,8 @@ def get_articles_by_iid(iid, **kwargs):
     é igual ao parâmetro: ``iid`` ordenado pelo atributo order.
 
     - ``iid``: chave primaria de número para escolher os artigos.
-    - ``kwargs``: parâmetros de filtragem.
+    - ``kwargs``: parâmetros de filtragem, utilize a chave ``only`` para indicar
+    a lista de campos a serem carregados (projeção).
 
     Em caso de não existir itens retorna {}.
 
@@ -884,12 +987,55 @@ def get_articles_by_iid(iid, **kwargs):
     if not iid:
         raise ValueError(__('Obrigatório um iid.'))
 
+    only = kwargs.pop('only', None)
+
     articles = Article.objects(issue=iid, **kwargs).order_by('order')
+    if only:
+        articles = articles.only(*only)
     if is_aop_issue(iid) or is_open_publication(articles):
         return articles.order_by('-publication_date')
     return articles
 
 
+def get_articles_by_issues(issues, **kwargs):
+    """
+    Retorna um dicionário de listas de artigos agrupados pelo id (``_id``) de
+    cada número do parâmetro ``issues``, com a mesma ordenação de
+    ``get_articles_by_iid``.
+
+    - ``issues``: lista de números (objetos ``Issue``).
+    - ``kwargs``: parâmetros de filtragem.
+
+    Os artigos são obtidos em uma única consulta e trazem apenas os campos
+    utilizados na listagem (título, seção e ordenação).
+
+    Em caso de não existir itens retorna {}.
+    """
+
+    issues_by_id = OrderedDict((issue.id, issue) for issue in issues)
+
+    if not issues_by_id:
+        return {}
+
+    articles = Article.objects(
+        issue__in=list(issues_by_id.keys()), **kwargs
+    ).only(
+        'issue', 'title', 'translated_titles', 'section', 'sections',
+        'order', 'publication_date', 'aop_pid'
+    ).order_by('order').no_dereference()
+
+    articles_by_issue = OrderedDict((_id, []) for _id in issues_by_id)
+    for article in articles:
+        # ``no_dereference``: ``article.issue`` é um DBRef, sem nova consulta
+        articles_by_issue[article.issue.id].append(article)
+
+    for _id, issue_articles in articles_by_issue.items():
+        if issues_by_id[_id].number == 'ahead' or is_open_publication(issue_articles):
+            issue_articles.sort(key=lambda article: article.publication_date or '', reverse=True)
+
+    return articles_by_issue
+
+
 def is_aop_issue(iid):
     """
     É um conjunto de artigos "ahead of print
@@ -912,46 +1058,102 @@ def is_open_publication(articles):
     )
 
 
-def get_article_by_pid(pid, **kwargs):
+def get_first_article_with_references(articles):
+    """
+    Retorna o primeiro artigo do queryset ``articles`` com as referências
+    ``issue`` e ``journal`` já carregadas.
+
+    As referências são obtidas na mesma consulta (agregação com ``$lookup``),
+    evitando uma consulta ao banco para cada referência acessada.
+
+    Em caso de não existir itens retorna None.
+    """
+
+    pipeline = (
+        {'$limit': 1},
+        {'$lookup': {
+            'from': Issue._get_collection_name(),
+            'localField': 'issue',
+            'foreignField': '_id',
+            'as': '_prefetched_issue'}},
+        {'$lookup': {
+            'from': Journal._get_collection_name(),
+            'localField': 'journal',
+            'foreignField': '_id',
+            'as': '_prefetched_journal'}},
+    )
+
+    for son in articles.aggregate(*pipeline):
+        issues = son.pop('_prefetched_issue')
+        journals = son.pop('_prefetched_journal')
+
+        article = Article._from_son(son)
+        # atribuição direta em ``_data`` para não marcar os campos como
+        # alterados
+        if issues:
+            article._data['issue'] = Issue._from_son(issues[0])
+        if journals:
+            article._data['journal'] = Journal._from_son(journals[0])
+        return article
+
+    return None
+
+
+def get_article_by_pid(pid, prefetch=False, **kwargs):
     """
     Retorna um artigo considerando os parâmetros ``pid``.
 
     - ``pid``: string, contendo o PID do artigo.
+    - ``prefetch``: boolean, carrega o número e o periódico do artigo na mesma
+    consulta (ver ``get_first_article_with_references``).
     """
 
     if not pid:
         raise ValueError(__('Obrigatório um pid.'))
 
-    return Article.objects(pid=pid, **kwargs).first()
+    articles = Article.objects(pid=pid, **kwargs)
+    if prefetch:
+        return get_first_article_with_references(articles)
+    return articles.first()
 
 
-def get_article_by_oap_pid(aop_pid, **kwargs):
+def get_article_by_oap_pid(aop_pid, prefetch=False, **kwargs):
     """
     Retorna um artigo considerando os parâmetros ``aop_pid``.
 
     - ``aop_pid``: string, contendo o OAP_PID do artigo.
+    - ``prefetch``: boolean, carrega o número e o periódico do artigo na mesma
+    consulta (ver ``get_first_article_with_references``).
     """
 
     if not aop_pid:
         raise ValueError(__('Obrigatório um aop_pid.'))
 
-    return Article.objects(aop_pid=aop_pid, **kwargs).first()
+    articles = Article.objects(aop_pid=aop_pid, **kwargs)
+    if prefetch:
+        return get_first_article_with_references(articles)
+    return articles.first()
 
 
-def get_article_by_scielo_pid(scielo_pid, **kwargs):
+def get_article_by_scielo_pid(scielo_pid, prefetch=False, **kwargs):
     """
     Retorna um artigo considerando os parâmetros ``scielo_pid``.
 
     - ``scielo_pid``: string, contendo o PID do artigo versão 1, 2 ou 3
+    - ``prefetch``: boolean, carrega o número e o periódico do artigo na mesma
+    consulta (ver ``get_first_article_with_references``).
     """
 
     if not scielo_pid:
         raise ValueError(__('Obrigatório um pid.'))
 
-    return Article.objects(
+    articles = Article.objects(
         (Q(scielo_pids__v1=scielo_pid) | Q(scielo_pids__v2=scielo_pid) | Q(scielo_pids__v3=scielo_pid)),
         **kwargs
-    ).first()
+    )
+    if prefetch:
+        return get_first_article_with_references(articles)
+    return articles.first()
 
 
 def get_recent_articles_of_issue(issue_iid, is_public=True):
@@ -17,3 +17,17 @@ def trans_alpha2(value):
 
 def datetimefilter(value, format="%Y-%m-%d %H:%M"):
     return utc_to_local(value).strftime(format)
+
+
+def text_langs(article):
+    """
+    Retorna a lista de idiomas dos textos completos (HTML) do artigo.
+    """
+    return [doc['lang'] for doc in article.htmls or []]
+
+
+def pdf_langs(article):
+    """
+    Retorna a lista de pares (idioma, url) dos PDFs do artigo.
+    """
+    return [(doc['lang'], doc['url']) for doc in article.pdfs or []]
@@ -3,15 +3,22 @@
 import logging
 import requests
 import mimetypes
-from io import BytesIO
-from bs4 import BeautifulSoup
-from urllib.parse import urlparse
+import gzip
+import ujson
+from functools import lru_cache, wraps
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
 from collections import OrderedDict
 from flask_babelex import gettext as _
-from flask import render_template, abort, current_app, request, session, redirect, jsonify, url_for, Response, send_from_directory, g
+from flask import render_template, abort, current_app, request, session, redirect, jsonify, url_for, Response, send_from_directory, g, make_response
 from werkzeug.contrib.atom import AtomFeed
-from urllib.parse import urljoin
+from werkzeug.local import LocalProxy
+from werkzeug.datastructures import LanguageAccept
+from werkzeug.http import parse_accept_header
+from werkzeug.wsgi import ClosingIterator
+from werkzeug.urls import url_quote
+from urllib.parse import urljoin, urlparse
 from legendarium.formatter import descriptive_short_format
 
 from . import main
@@ -27,6 +34,7 @@ from webapp.config.lang_names import display_original_lang_name
 
 from lxml import etree
 from packtools import HTMLGenerator
+from packtools.domain import XSLT
 
 logger = logging.getLogger(__name__)
 
@@ -34,12 +42,123 @@ JOURNAL_UNPUBLISH = _("O periódico está indisponível por motivo de: ")
 ISSUE_UNPUBLISH = _("O número está indisponível por motivo de: ")
 ARTICLE_UNPUBLISH = _("O artigo está indisponível por motivo de: ")
 
+# XSLT do ``HTMLGenerator`` compartilhado entre as requisições, assim a folha
+# de estilo é compilada uma única vez por processo.
+HTML_GENERATOR_XSLT = XSLT('root-html-2.0.xslt')
+
+# Parser do XML dos artigos compartilhado entre as requisições (o lxml
+# serializa o uso do parser entre threads); as entidades não são resolvidas.
+XML_PARSER = etree.XMLParser(resolve_entities=False)
+
+ALLOWED_QUERY_FILTERS = frozenset(["current", "no-current", ""])
+THEMATIC_TABLE = {
+    "areas": "study_areas",
+    "wos": "subject_categories",
+    "publisher": "publisher_name",
+}
+
+# Páginas antigas do periódico e a âncora correspondente em ``about_journal``
+# (ver router_legacy_info_pages)
+LEGACY_PAGE_ANCHORS = {
+    'iaboutj': '#about',
+    'eaboutj': '#about',
+    'paboutj': '#about',
+    'eedboard': '#editors',
+    'iedboard': '#editors',
+    'pedboard': '#editors',
+    'iinstruc': '#instructions',
+    'pinstruc': '#instructions',
+    'einstruc': '#instructions'
+}
+# Páginas antigas do artigo (ver router_legacy_article)
+LEGACY_ARTICLE_PAGES = frozenset(['fbtext', 'fbabs'])
+
+# Endpoints cujas respostas recebem ETag e Cache-Control (ver add_language_code)
+CONDITIONAL_GET_ENDPOINTS = frozenset([
+    'main.index', 'main.collection_list', 'main.journal_detail', 'main.about_journal',
+    'main.issue_feed',
+])
+
+# Cache-Control (max-age, em segundos) das respostas dos endpoints acima
+CONDITIONAL_GET_MAX_AGE = 300
+
+# Cache-Control (max-age, em segundos) dos arquivos estáticos servidos pelas
+# views (robots.txt e imagem do texto completo)
+STATIC_FILE_MAX_AGE = 86400
+
+# Nível de compressão do corpo gzip armazenado junto com a resposta em cache
+# (ver with_gzip_body)
+GZIP_COMPRESS_LEVEL = 6
+
+# Marcadores usados para construir uma única vez a URL do artigo e
+# completá-la por artigo/idioma com ``str.replace`` (ver issue_feed)
+URL_SEG_ARTICLE_PLACEHOLDER = '__url_seg_article__'
+LANG_CODE_PLACEHOLDER = '__lang_code__'
+
+# Tamanho das partes do conteúdo repassado do SSM (ver get_content_from_ssm)
+SSM_STREAM_CHUNK_SIZE = 64 * 1024
+
+# Campos do artigo utilizados na listagem do sumário (``issue/toc.html``)
+TOC_ARTICLE_FIELDS = (
+    'title', 'translated_titles', 'section', 'sections', 'authors', 'pid',
+    'aop_pid', 'doi', 'url_segment', 'order', 'publication_date', 'abstract',
+    'abstracts', 'abstract_languages', 'htmls', 'pdfs', 'languages',
+    'original_language',
+)
+
+# Campos do artigo utilizados no feed do número (ver issue_feed)
+FEED_ARTICLE_FIELDS = (
+    'title', 'authors', 'abstract', 'doi', 'pid', 'aop_pid', 'url_segment',
+    'order', 'publication_date', 'languages', 'original_language',
+)
+
+# Campos dos artigos vizinhos (anterior/próximo) usados na navegação do
+# artigo; ``publication_date`` e ``aop_pid`` definem a ordenação do número.
+NAVIGATION_ARTICLE_FIELDS = ('url_segment', 'order', 'publication_date', 'aop_pid')
+
 
 def url_external(endpoint, **kwargs):
     url = url_for(endpoint, **kwargs)
     return urljoin(request.url_root, url)
 
 
+def fast_jsonify(data):
+    """
+    Equivalente ao ``jsonify`` para estruturas de tipos simples (str, int,
+    bool, None, listas e dicionários), serializadas com ``ujson``.
+    """
+    return current_app.response_class(ujson.dumps(data), mimetype='application/json')
+
+
+@lru_cache(maxsize=1024)
+def _study_area_labels(study_areas):
+    """Retorna os rótulos (traduzíveis) das áreas temáticas ``study_areas``.
+
+    ``study_areas`` deve ser uma tupla para que possa ser usada como chave do
+    cache.
+    """
+    return tuple(STUDY_AREAS.get(study_area.upper()) for study_area in study_areas)
+
+
+@lru_cache(maxsize=1024)
+def _legend(title, short_title, pubdate, volume, number, suppl, language):
+    """Versão memorizada de ``descriptive_short_format``, que é função pura de
+    seus argumentos.
+    """
+    return descriptive_short_format(
+        title=title, short_title=short_title, pubdate=pubdate, volume=volume,
+        number=number, suppl=suppl, language=language)
+
+
+def _issue_legend(journal, issue, language):
+    """Retorna a legenda bibliográfica do número ``issue`` do periódico
+    ``journal`` no idioma ``language`` (ex.: ``pt_BR``).
+    """
+    return _legend(
+        journal.title, journal.short_title, str(issue.year), issue.volume,
+        issue.number, issue.suppl_text, language[:2].lower())
+
+
 class RetryableError(Exception):
     """Erro recuperável sem que seja necessário modificar o estado dos dados
     na parte cliente, e.g., timeouts, erros advindos de particionamento de rede
@@ -53,9 +172,32 @@ class NonRetryableError(Exception):
     """
 
 
-def fetch_data(url: str, timeout: float = 2) -> bytes:
+def _new_http_session():
+    """Sessão HTTP compartilhada entre as requisições ao SSM, de modo que as
+    conexões sejam reaproveitadas (keep-alive) pelo pool do urllib3.
+
+    As tentativas são repetidas apenas para falhas transitórias do servidor;
+    esgotadas as tentativas a última resposta é devolvida (``raise_on_status``)
+    para que ``fetch_data`` a traduza em ``RetryableError``.
+    """
+    retries = Retry(total=2, backoff_factor=0.2,
+                    status_forcelist=[502, 503, 504], raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=50,
+                          max_retries=retries)
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+_SESSION = _new_http_session()
+
+
+def _get(url: str, timeout: float = 2, stream: bool = False,
+         headers: dict = None) -> requests.Response:
     try:
-        response = requests.get(url, timeout=timeout)
+        response = _SESSION.get(url, timeout=timeout, stream=stream,
+                                headers=headers)
     except (requests.ConnectionError, requests.Timeout) as exc:
         raise RetryableError(exc) from exc
     except (requests.InvalidSchema, requests.MissingSchema, requests.InvalidURL) as exc:
@@ -64,6 +206,8 @@ def fetch_data(url: str, timeout: float = 2) -> bytes:
         try:
             response.raise_for_status()
         except requests.HTTPError as exc:
+            # libera a conexão (necessário com ``stream=True``)
+            response.close()
             if 400 <= exc.response.status_code < 500:
                 raise NonRetryableError(exc) from exc
             elif 500 <= exc.response.status_code < 600:
@@ -71,27 +215,134 @@ def fetch_data(url: str, timeout: float = 2) -> bytes:
             else:
                 raise
 
-    return response.content
+    return response
 
 
-@main.before_app_request
-def add_collection_to_g():
-    if not hasattr(g, 'collection'):
+def fetch_data(url: str, timeout: float = 2) -> bytes:
+    return _get(url, timeout).content
+
+
+def fetch_data_stream(url: str, timeout: float = 2) -> requests.Response:
+    """Como ``fetch_data``, porém retorna a resposta com o corpo ainda não
+    lido (``stream=True``), para ser repassado ao cliente em partes com
+    ``raw.stream``. O conteúdo é solicitado sem compressão
+    (``Accept-Encoding: identity``), pois é repassado como recebido a clientes
+    que podem não aceitar gzip. Cabe a quem chama fechar a resposta.
+    """
+    return _get(url, timeout, stream=True,
+                headers={'Accept-Encoding': 'identity'})
+
+
+def _get_collection_from_g():
+    """
+    Obtém a coleção corrente apenas uma vez por requisição, guardando o
+    resultado em ``g``.
+    """
+    if not hasattr(g, '_collection'):
         try:
             collection = controllers.get_current_collection()
-            setattr(g, 'collection', collection)
+            setattr(g, '_collection', collection)
         except Exception:
             # discutir o que fazer aqui
-            setattr(g, 'collection', {})
+            setattr(g, '_collection', {})
+    return g._collection
+
+
+@main.before_app_request
+def add_collection_to_g():
+    if not hasattr(g, 'collection'):
+        # A consulta só é feita no primeiro acesso a ``g.collection``, assim
+        # requisições que não usam a coleção (ajax, arquivos etc.) não
+        # consultam o banco.
+        setattr(g, 'collection', LocalProxy(_get_collection_from_g))
+
+
+def with_gzip_body(view):
+    """Decorator que prepara a resposta da view para ser enviada comprimida
+    com gzip aos clientes que a aceitam (ver ``send_gzip_body``).
+
+    Com o cache ativo (``CACHE_ENABLED``) o corpo comprimido é calculado aqui
+    (atributo ``gzip_body``) e armazenado no cache junto com a resposta, por
+    isso o decorator deve ser aplicado abaixo do ``@cache.cached``. Com o
+    HTMLMIN ativo (``MINIFY_PAGE``) o HTML é minificado antes da compressão,
+    para que o corpo comprimido tenha o mesmo conteúdo entregue aos demais
+    clientes.
+
+    Sem cache, a resposta é apenas marcada (atributo ``gzip_on_send``) e a
+    compressão fica a cargo do ``send_gzip_body``.
+    """
+    @wraps(view)
+    def decorated_view(*args, **kwargs):
+        response = make_response(view(*args, **kwargs))
+        if response.status_code != 200 or response.direct_passthrough:
+            return response
+
+        if not current_app.config['CACHE_ENABLED']:
+            response.gzip_on_send = True
+            return response
+
+        htmlmin = current_app.extensions.get('htmlmin')
+        if (htmlmin is not None and current_app.config.get('MINIFY_PAGE') and
+                response.content_type == 'text/html; charset=utf-8'):
+            response.set_data(
+                htmlmin.html_minify.minify(response.get_data(as_text=True)))
+        response.gzip_body = gzip.compress(
+            response.get_data(), compresslevel=GZIP_COMPRESS_LEVEL)
+        return response
+    return decorated_view
+
+
+def send_gzip_body(response):
+    """
+    Envia o corpo comprimido (ver ``with_gzip_body``) aos clientes que aceitam
+    gzip; sem o corpo pré-comprimido a compressão é feita somente nesse caso.
+
+    É registrado na app (``create_app``) antes do HTMLMIN para ser executado
+    depois da minificação, que espera o corpo como texto.
+    """
+    gzip_body = getattr(response, 'gzip_body', None)
+    if gzip_body is None and not getattr(response, 'gzip_on_send', False):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    if 'gzip' in request.accept_encodings and 'Content-Encoding' not in response.headers:
+        if gzip_body is None:
+            gzip_body = gzip.compress(
+                response.get_data(), compresslevel=GZIP_COMPRESS_LEVEL)
+        response.set_data(gzip_body)
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
 
 
 @main.after_request
 def add_language_code(response):
     language = session.get('lang', get_locale())
     response.set_cookie('language', language)
+
+    if (request.method == 'GET' and response.status_code == 200 and
+            request.endpoint in CONDITIONAL_GET_ENDPOINTS):
+        # Permite que o cliente revalide a página (If-None-Match) e receba
+        # um 304 sem o corpo. O idioma vem da sessão (cookie) ou do
+        # cabeçalho Accept-Language, por isso ambos entram no Vary. A resposta
+        # leva Set-Cookie (idioma, sessão), portanto não deve ser armazenada
+        # por caches compartilhados (proxies, CDN).
+        response.add_etag()
+        response.cache_control.max_age = CONDITIONAL_GET_MAX_AGE
+        response.cache_control.private = True
+        response.vary.update(('Accept-Language', 'Cookie'))
+        response.make_conditional(request)
+
     return response
 
 
+def _is_ajax_request():
+    """Indica se a requisição corrente foi feita por ajax (cabeçalho
+    ``X-Requested-With``), em substituição ao ``request.is_xhr``, obsoleto no
+    Werkzeug.
+    """
+    return request.headers.get('X-Requested-With', '').lower() == 'xmlhttprequest'
+
+
 @main.before_app_request
 def add_forms_to_g():
     setattr(g, 'email_share', forms.EmailShareForm())
@@ -99,22 +350,46 @@ def add_forms_to_g():
     setattr(g, 'error', forms.ErrorForm())
 
 
+def get_scielo_org_links_by_lang():
+    """
+    Retorna os links de SCIELO_ORG_URIS indexados por idioma, i.e.,
+    ``{lang: {key: url}}``. Como a configuração é estática, o dicionário é
+    montado apenas uma vez e mantido em ``current_app.extensions``.
+    """
+    links_by_lang = current_app.extensions.get('scielo_org_links')
+    if links_by_lang is None:
+        links_by_lang = {}
+        for key, urls in current_app.config.get('SCIELO_ORG_URIS', {}).items():
+            for lang, url in urls.items():
+                links_by_lang.setdefault(lang, {})[key] = url
+        current_app.extensions['scielo_org_links'] = links_by_lang
+    return links_by_lang
+
+
 @main.before_app_request
 def add_scielo_org_config_to_g():
     language = session.get('lang', get_locale())
-    scielo_org_links = {
-        key: url[language]
-        for key, url in current_app.config.get('SCIELO_ORG_URIS', {}).items()
-    }
+    scielo_org_links = get_scielo_org_links_by_lang().get(language, {})
     setattr(g, 'scielo_org', scielo_org_links)
 
 
+@lru_cache(maxsize=2048)
+def _best_match_language(accept_language, languages):
+    """
+    Retorna o idioma de ``languages`` que melhor atende ao cabeçalho
+    ``Accept-Language``. Os valores desse cabeçalho se repetem muito entre
+    os clientes, por isso o resultado é memorizado.
+    """
+    return parse_accept_header(accept_language, LanguageAccept).best_match(languages)
+
+
 @babel.localeselector
 def get_locale():
     langs = current_app.config.get('LANGUAGES')
-    lang_from_headers = request.accept_languages.best_match(list(langs.keys()))
+    lang_from_headers = _best_match_language(
+        request.headers.get('Accept-Language', ''), tuple(langs))
 
-    if 'lang' not in list(session.keys()):
+    if 'lang' not in session:
         session['lang'] = lang_from_headers
 
     if not lang_from_headers and not session['lang']:
@@ -129,7 +404,7 @@ def get_locale():
 def set_locale(lang_code):
     langs = current_app.config.get('LANGUAGES')
 
-    if lang_code not in list(langs.keys()):
+    if lang_code not in langs:
         abort(400, _('Código de idioma inválido'))
 
     referrer = request.referrer
@@ -191,10 +466,9 @@ def index():
 @main.route('/journals/alpha')
 @cache.cached(key_prefix=cache_key_with_lang)
 def collection_list():
-    allowed_filters = ["current", "no-current", ""]
     query_filter = request.args.get("status", "")
 
-    if not query_filter in allowed_filters:
+    if query_filter not in ALLOWED_QUERY_FILTERS:
         query_filter = ""
 
     journals_list = [
@@ -209,26 +483,19 @@ def collection_list():
 @main.route("/journals/thematic")
 @cache.cached(key_prefix=cache_key_with_lang)
 def collection_list_thematic():
-    allowed_query_filters = ["current", "no-current", ""]
-    allowed_thematic_filters = ["areas", "wos", "publisher"]
-    thematic_table = {
-        "areas": "study_areas",
-        "wos": "subject_categories",
-        "publisher": "publisher_name",
-    }
     query_filter = request.args.get("status", "")
     title_query = request.args.get("query", "")
     thematic_filter = request.args.get("filter", "areas")
 
-    if not query_filter in allowed_query_filters:
+    if query_filter not in ALLOWED_QUERY_FILTERS:
         query_filter = ""
 
-    if not thematic_filter in allowed_thematic_filters:
+    if thematic_filter not in THEMATIC_TABLE:
         thematic_filter = "areas"
 
     lang = get_lang_from_session()[:2].lower()
     objects = controllers.get_journals_grouped_by(
-        thematic_table[thematic_filter],
+        THEMATIC_TABLE[thematic_filter],
         title_query,
         query_filter=query_filter,
         lang=lang,
@@ -255,25 +522,34 @@ def collection_list_feed():
     journals = controllers.get_journals_paginated(
         title_query='', page=1, order_by='-created', per_page=10)
 
+    # resolve o template uma única vez, fora do laço
+    feed_template = current_app.jinja_env.get_template(
+        "collection/list_feed_content.html")
+
     if not journals.items:
         feed.add('Nenhum periódico encontrado',
                  url=request.url,
                  updated=datetime.now())
 
+    # Busca em lote o último número de cada periódico e os seus artigos
+    last_issues = controllers.get_last_issues_by_jids(
+        [journal.id for journal in journals.items], is_public=True)
+    articles_by_issue = controllers.get_articles_by_issues(
+        list(last_issues.values()), is_public=True)
+
+    section_language = language[:2]
+
     for journal in journals.items:
-        issues = controllers.get_issues_by_jid(journal.jid, is_public=True)
-        last_issue = issues[0] if issues else None
+        last_issue = last_issues.get(journal.id)
 
         articles = []
         if last_issue:
-            articles = controllers.get_articles_by_iid(last_issue.iid,
-                                                       is_public=True)
+            articles = articles_by_issue.get(last_issue.id, [])
 
         result_dict = OrderedDict()
         for article in articles:
-            section = article.get_section_by_lang(language[:2])
-            result_dict.setdefault(section, [])
-            result_dict[section].append(article)
+            section = article.get_section_by_lang(section_language)
+            result_dict.setdefault(section, []).append(article)
 
         context = {
             'journal': journal,
@@ -283,7 +559,7 @@ def collection_list_feed():
         }
 
         feed.add(journal.title,
-                 render_template("collection/list_feed_content.html", **context),
+                 render_template(feed_template, **context),
                  content_type='html',
                  author=journal.publisher_name,
                  url=url_external('main.journal_detail', url_seg=journal.url_segment),
@@ -318,118 +594,129 @@ def about_collection(slug_name=None):
 # ###################################Journal#####################################
 
 
-@main.route('/scielo.php/')
-@cache.cached(key_prefix=cache_key_with_lang_with_qs)
-def router_legacy():
+def _abort_if_article_unpublished(article):
+    """
+    Aborta com 404 caso o artigo, o seu número ou o seu periódico não
+    estejam públicos.
+    """
+    if not article.is_public:
+        abort(404, ARTICLE_UNPUBLISH + _(article.unpublish_reason))
 
-    script_php = request.args.get('script', None)
-    pid = request.args.get('pid', None)
-    tlng = request.args.get('tlng', None)
-    allowed_scripts = [
-        'sci_serial', 'sci_issuetoc', 'sci_arttext', 'sci_abstract', 'sci_issues', 'sci_pdf'
-    ]
-    if (script_php is not None) and (script_php in allowed_scripts) and not pid:
-        # se tem pelo menos um param: pid ou script_php
-        abort(400, _(u'Requsição inválida ao tentar acessar o artigo com pid: %s' % pid))
-    elif script_php and pid:
+    if not article.issue.is_public:
+        abort(404, ISSUE_UNPUBLISH + _(article.issue.unpublish_reason))
+
+    if not article.journal.is_public:
+        abort(404, JOURNAL_UNPUBLISH + _(article.journal.unpublish_reason))
 
-        if script_php == 'sci_serial':
-            # pid = issn
-            journal = controllers.get_journal_by_issn(pid)
 
-            if not journal:
-                abort(404, _('Periódico não encontrado'))
+def _get_public_journal_by_legacy_pid(pid):
+    # pid = issn
+    journal = controllers.get_journal_by_issn(pid)
 
-            if not journal.is_public:
-                abort(404, JOURNAL_UNPUBLISH + _(journal.unpublish_reason))
+    if not journal:
+        abort(404, _('Periódico não encontrado'))
 
-            return journal_detail(journal.url_segment)
+    if not journal.is_public:
+        abort(404, JOURNAL_UNPUBLISH + _(journal.unpublish_reason))
 
-        elif script_php == 'sci_issuetoc':
+    return journal
 
-            issue = controllers.get_issue_by_pid(pid)
 
-            if not issue:
-                abort(404, _('Número não encontrado'))
+def _get_public_article_by_legacy_pid(pid):
+    article = controllers.get_article_by_pid(pid, prefetch=True)
 
-            if not issue.is_public:
-                abort(404, ISSUE_UNPUBLISH + _(issue.unpublish_reason))
+    if not article:
+        article = controllers.get_article_by_oap_pid(pid, prefetch=True)
 
-            if not issue.journal.is_public:
-                abort(404, JOURNAL_UNPUBLISH + _(issue.journal.unpublish_reason))
+    if not article:
+        abort(404, _('Artigo não encontrado'))
 
-            return redirect(
-                url_for(
-                    "main.issue_toc",
-                    url_seg=issue.journal.url_segment,
-                    url_seg_issue=issue.url_segment),
-                301
-            )
+    _abort_if_article_unpublished(article)
 
-        elif script_php == 'sci_arttext' or script_php == 'sci_abstract':
+    return article
 
-            article = controllers.get_article_by_pid(pid)
 
-            if not article:
-                article = controllers.get_article_by_oap_pid(pid)
+def _router_legacy_serial(pid, tlng):
+    journal = _get_public_journal_by_legacy_pid(pid)
+    return journal_detail(journal.url_segment)
 
-            if not article:
-                abort(404, _('Artigo não encontrado'))
 
-            if not article.is_public:
-                abort(404, ARTICLE_UNPUBLISH + _(article.unpublish_reason))
+def _router_legacy_issuetoc(pid, tlng):
+    issue = controllers.get_issue_by_pid(pid)
 
-            if not article.issue.is_public:
-                abort(404, ISSUE_UNPUBLISH + _(article.issue.unpublish_reason))
+    if not issue:
+        abort(404, _('Número não encontrado'))
 
-            if not article.journal.is_public:
-                abort(404, JOURNAL_UNPUBLISH + _(article.journal.unpublish_reason))
+    if not issue.is_public:
+        abort(404, ISSUE_UNPUBLISH + _(issue.unpublish_reason))
 
-            return redirect(url_for('main.article_detail',
-                                    url_seg=article.journal.url_segment,
-                                    url_seg_issue=article.issue.url_segment,
-                                    url_seg_article=article.url_segment,
-                                    lang_code=tlng), code=301)
+    if not issue.journal.is_public:
+        abort(404, JOURNAL_UNPUBLISH + _(issue.journal.unpublish_reason))
 
-        elif script_php == 'sci_issues':
+    return redirect(
+        url_for(
+            "main.issue_toc",
+            url_seg=issue.journal.url_segment,
+            url_seg_issue=issue.url_segment),
+        301
+    )
 
-            journal = controllers.get_journal_by_issn(pid)
 
-            if not journal:
-                abort(404, _('Periódico não encontrado'))
+def _router_legacy_arttext(pid, tlng):
+    article = _get_public_article_by_legacy_pid(pid)
 
-            if not journal.is_public:
-                abort(404, JOURNAL_UNPUBLISH + _(journal.unpublish_reason))
+    return redirect(url_for('main.article_detail',
+                            url_seg=article.journal.url_segment,
+                            url_seg_issue=article.issue.url_segment,
+                            url_seg_article=article.url_segment,
+                            lang_code=tlng), code=301)
 
-            return issue_grid(journal.url_segment)
 
-        elif script_php == 'sci_pdf':
-            # accesso ao pdf do artigo:
-            article = controllers.get_article_by_pid(pid)
+def _router_legacy_issues(pid, tlng):
+    journal = _get_public_journal_by_legacy_pid(pid)
+    return issue_grid(journal.url_segment)
 
-            if not article:
-                article = controllers.get_article_by_oap_pid(pid)
 
-            if not article:
-                abort(404, _('Artigo não encontrado'))
+def _router_legacy_pdf(pid, tlng):
+    # accesso ao pdf do artigo:
+    article = _get_public_article_by_legacy_pid(pid)
 
-            if not article.is_public:
-                abort(404, ARTICLE_UNPUBLISH + _(article.unpublish_reason))
+    return article_detail_pdf(
+        article.journal.url_segment,
+        article.issue.url_segment,
+        article.url_segment)
 
-            if not article.issue.is_public:
-                abort(404, ISSUE_UNPUBLISH + _(article.issue.unpublish_reason))
 
-            if not article.journal.is_public:
-                abort(404, JOURNAL_UNPUBLISH + _(article.journal.unpublish_reason))
+# Tabela de despacho: valor do parâmetro ``script`` -> função de tratamento
+LEGACY_SCRIPT_HANDLERS = {
+    'sci_serial': _router_legacy_serial,
+    'sci_issuetoc': _router_legacy_issuetoc,
+    'sci_arttext': _router_legacy_arttext,
+    'sci_abstract': _router_legacy_arttext,
+    'sci_issues': _router_legacy_issues,
+    'sci_pdf': _router_legacy_pdf,
+}
 
-            return article_detail_pdf(
-                article.journal.url_segment,
-                article.issue.url_segment,
-                article.url_segment)
 
-        else:
+@main.route('/scielo.php/')
+@cache.cached(key_prefix=cache_key_with_lang_with_qs)
+def router_legacy():
+
+    script_php = request.args.get('script')
+    pid = request.args.get('pid')
+    tlng = request.args.get('tlng')
+
+    if script_php in LEGACY_SCRIPT_HANDLERS and not pid:
+        # se tem pelo menos um param: pid ou script_php
+        abort(400, _(u'Requsição inválida ao tentar acessar o artigo com pid: %s' % pid))
+    elif script_php and pid:
+        handler = LEGACY_SCRIPT_HANDLERS.get(script_php)
+
+        if handler is None:
             abort(400, _(u'Requsição inválida ao tentar acessar o artigo com pid: %s' % pid))
 
+        return handler(pid, tlng)
+
     else:
         return redirect('/')
 
@@ -482,10 +769,7 @@ def journal_detail(url_seg):
 
     if len(issues) > 0:
         latest_issue = issues[0]
-        latest_issue_legend = descriptive_short_format(
-            title=latest_issue.journal.title, short_title=latest_issue.journal.short_title,
-            pubdate=str(latest_issue.year), volume=latest_issue.volume, number=latest_issue.number,
-            suppl=latest_issue.suppl_text, language=language[:2].lower())
+        latest_issue_legend = _issue_legend(journal, latest_issue, language)
     else:
         latest_issue = None
         latest_issue_legend = ''
@@ -496,9 +780,7 @@ def journal_detail(url_seg):
         'journal': journal,
         'press_releases': press_releases,
         'recent_articles': recent_articles,
-        'journal_study_areas': [
-            STUDY_AREAS.get(study_area.upper()) for study_area in journal.study_areas
-        ],
+        'journal_study_areas': _study_area_labels(tuple(journal.study_areas)),
         # o primiero item da lista é o último número.
         # condicional para verificar se issues contém itens
         'last_issue': latest_issue,
@@ -533,6 +815,9 @@ def journal_feed(url_seg):
     feed_language = session.get('lang', get_locale())
     feed_language = feed_language[:2].lower()
 
+    # resolve o template uma única vez, fora do laço
+    feed_template = current_app.jinja_env.get_template("issue/feed_content.html")
+
     for article in articles:
 
         # ######### TODO: Revisar #########
@@ -541,7 +826,7 @@ def journal_feed(url_seg):
             article_lang = article.original_language
 
         feed.add(article.title or _('Artigo sem título'),
-                 render_template("issue/feed_content.html", article=article),
+                 render_template(feed_template, article=article),
                  content_type='html',
                  id=article.doi or article.pid,
                  author=article.authors,
@@ -575,10 +860,7 @@ def about_journal(url_seg):
     latest_issue = issues[0] if issues else None
 
     if latest_issue:
-        latest_issue_legend = descriptive_short_format(
-            title=latest_issue.journal.title, short_title=latest_issue.journal.short_title,
-            pubdate=str(latest_issue.year), volume=latest_issue.volume, number=latest_issue.number,
-            suppl=latest_issue.suppl_text, language=language[:2].lower())
+        latest_issue_legend = _issue_legend(journal, latest_issue, language)
     else:
         latest_issue_legend = None
 
@@ -597,9 +879,7 @@ def about_journal(url_seg):
         'journal': journal,
         'latest_issue_legend': latest_issue_legend,
         'last_issue': latest_issue,
-        'journal_study_areas': [
-            STUDY_AREAS.get(study_area.upper()) for study_area in journal.study_areas
-        ],
+        'journal_study_areas': _study_area_labels(tuple(journal.study_areas)),
     }
 
     if page:
@@ -614,11 +894,11 @@ def about_journal(url_seg):
 @cache.cached(key_prefix=cache_key_with_lang_with_qs)
 def journals_search_alpha_ajax():
 
-    if not request.is_xhr:
+    if not _is_ajax_request():
         abort(400, _('Requisição inválida. Deve ser por ajax'))
 
-    query = request.args.get('query', '', type=str)
-    query_filter = request.args.get('query_filter', '', type=str)
+    query = request.args.get('query', '')
+    query_filter = request.args.get('query_filter', '')
     page = request.args.get('page', 1, type=int)
     lang = get_lang_from_session()[:2].lower()
 
@@ -628,19 +908,19 @@ def journals_search_alpha_ajax():
                         page=page,
                         lang=lang)
 
-    return jsonify(response_data)
+    return fast_jsonify(response_data)
 
 
 @main.route("/journals/search/group/by/filter/ajax/", methods=['GET'])
 @cache.cached(key_prefix=cache_key_with_lang_with_qs)
 def journals_search_by_theme_ajax():
 
-    if not request.is_xhr:
+    if not _is_ajax_request():
         abort(400, _('Requisição inválida. Deve ser por ajax'))
 
-    query = request.args.get('query', '', type=str)
-    query_filter = request.args.get('query_filter', '', type=str)
-    filter = request.args.get('filter', 'areas', type=str)
+    query = request.args.get('query', '')
+    query_filter = request.args.get('query_filter', '')
+    filter = request.args.get('filter', 'areas')
     lang = get_lang_from_session()[:2].lower()
 
     if filter == 'areas':
@@ -654,7 +934,7 @@ def journals_search_by_theme_ajax():
             'error': 401,
             'message': _('Parámetro "filter" é inválido, deve ser "areas", "wos" ou "publisher".')
         })
-    return jsonify(objects)
+    return fast_jsonify(objects)
 
 
 @main.route("/journals/download/<string:list_type>/<string:extension>/", methods=['GET', ])
@@ -669,7 +949,7 @@ def download_journal_list(list_type, extension):
             mimetype = 'application/vnd.ms-excel'
         else:
             mimetype = 'text/csv'
-        query = request.args.get('query', '', type=str)
+        query = request.args.get('query', '')
         data = controllers.get_journal_generator_for_csv(list_type=list_type,
                                                          title_query=query,
                                                          extension=extension.lower())
@@ -683,7 +963,7 @@ def download_journal_list(list_type, extension):
 @main.route("/<string:url_seg>/contact", methods=['POST'])
 def contact(url_seg):
 
-    if not request.is_xhr:
+    if not _is_ajax_request():
         abort(403, _('Requisição inválida, deve ser ajax.'))
 
     if utils.is_recaptcha_valid(request):
@@ -752,10 +1032,7 @@ def issue_grid(url_seg):
     issues_data = controllers.get_issues_for_grid_by_jid(journal.id, is_public=True)
     latest_issue = issues_data['last_issue']
     if latest_issue:
-        latest_issue_legend = descriptive_short_format(
-            title=latest_issue.journal.title, short_title=latest_issue.journal.short_title,
-            pubdate=str(latest_issue.year), volume=latest_issue.volume, number=latest_issue.number,
-            suppl=latest_issue.suppl_text, language=language[:2].lower())
+        latest_issue_legend = _issue_legend(journal, latest_issue, language)
     else:
         latest_issue_legend = None
 
@@ -768,9 +1045,7 @@ def issue_grid(url_seg):
         'volume_issue': issues_data['volume_issue'],
         'ahead': issues_data['ahead'],
         'result_dict': issues_data['ordered_for_grid'],
-        'journal_study_areas': [
-            STUDY_AREAS.get(study_area.upper()) for study_area in journal.study_areas
-        ],
+        'journal_study_areas': _study_area_labels(tuple(journal.study_areas)),
     }
 
     return render_template("issue/grid.html", **context)
@@ -791,7 +1066,7 @@ def issue_toc(url_seg, url_seg_issue):
     # idioma da sessão
     language = session.get('lang', get_locale())
 
-    section_filter = request.args.get('section', '', type=str)
+    section_filter = request.args.get('section', '')
 
     issue = controllers.get_issue_by_url_seg(url_seg, url_seg_issue)
 
@@ -806,7 +1081,8 @@ def issue_toc(url_seg, url_seg_issue):
     if not journal.is_public:
         abort(404, JOURNAL_UNPUBLISH + _(journal.unpublish_reason))
 
-    articles = controllers.get_articles_by_iid(issue.iid, is_public=True)
+    articles = controllers.get_articles_by_iid(
+        issue.iid, is_public=True, only=TOC_ARTICLE_FIELDS)
 
     if articles:
         sections = list(articles.item_frequencies('section').keys())
@@ -819,22 +1095,14 @@ def issue_toc(url_seg, url_seg_issue):
     if section_filter != '':
         articles = articles.filter(section__iexact=section_filter)
 
-    issue_list = [_issue for _issue in issues]
+    # uma única passada no queryset, reaproveitada para anterior/próximo e
+    # para o último número.
+    issue_list = list(issues)
 
     previous_issue = utils.get_prev_issue(issue_list, issue)
     next_issue = utils.get_next_issue(issue_list, issue)
 
-    for article in articles:
-        article_text_languages = [doc['lang'] for doc in article.htmls]
-        article_pdf_languages = [(doc['lang'], doc['url']) for doc in article.pdfs]
-
-        setattr(article, "article_text_languages", article_text_languages)
-        setattr(article, "article_pdf_languages", article_pdf_languages)
-
-    issue_legend = descriptive_short_format(
-        title=journal.title, short_title=journal.short_title,
-        pubdate=str(issue.year), volume=issue.volume, number=issue.number,
-        suppl=issue.suppl_text, language=language[:2].lower())
+    issue_legend = _issue_legend(journal, issue, language)
 
     context = {
         'next_issue': next_issue,
@@ -845,11 +1113,9 @@ def issue_toc(url_seg, url_seg_issue):
         'articles': articles,
         'sections': sections,
         'section_filter': section_filter,
-        'journal_study_areas': [
-            STUDY_AREAS.get(study_area.upper()) for study_area in journal.study_areas
-        ],
+        'journal_study_areas': _study_area_labels(tuple(journal.study_areas)),
         # o primiero item da lista é o último número.
-        'last_issue': issues[0] if issues else None
+        'last_issue': issue_list[0] if issue_list else None
     }
 
     return render_template("issue/toc.html", **context)
@@ -866,11 +1132,13 @@ def issue_feed(url_seg, url_seg_issue):
     if not issue.is_public:
         abort(404, ISSUE_UNPUBLISH + _(issue.unpublish_reason))
 
-    if not issue.journal.is_public:
-        abort(404, JOURNAL_UNPUBLISH + _(issue.journal.unpublish_reason))
-
     journal = issue.journal
-    articles = controllers.get_articles_by_iid(issue.iid, is_public=True)
+
+    if not journal.is_public:
+        abort(404, JOURNAL_UNPUBLISH + _(journal.unpublish_reason))
+
+    articles = controllers.get_articles_by_iid(
+        issue.iid, is_public=True, only=FEED_ARTICLE_FIELDS)
 
     feed = AtomFeed(journal.title or "",
                     feed_url=request.url,
@@ -878,6 +1146,20 @@ def issue_feed(url_seg, url_seg_issue):
                     subtitle=utils.get_label_issue(issue))
 
     feed_language = session.get('lang', get_locale())
+    feed_template = current_app.jinja_env.get_template("issue/feed_content.html")
+
+    # a URL dos artigos é construída uma única vez e completada para cada
+    # artigo, sem percorrer o mapa de URLs a cada iteração
+    article_url = url_external('main.article_detail',
+                               url_seg=journal.url_segment,
+                               url_seg_issue=issue.url_segment,
+                               url_seg_article=URL_SEG_ARTICLE_PLACEHOLDER,
+                               lang_code=LANG_CODE_PLACEHOLDER)
+    # artigos sem idioma (``original_language`` vazio) têm a URL sem lang_code
+    article_url_without_lang = url_external('main.article_detail',
+                                            url_seg=journal.url_segment,
+                                            url_seg_issue=issue.url_segment,
+                                            url_seg_article=URL_SEG_ARTICLE_PLACEHOLDER)
 
     for article in articles:
         # ######### TODO: Revisar #########
@@ -885,16 +1167,19 @@ def issue_feed(url_seg, url_seg_issue):
         if feed_language not in article.languages:
             article_lang = article.original_language
 
+        if article_lang:
+            url = article_url.replace(LANG_CODE_PLACEHOLDER, article_lang)
+        else:
+            url = article_url_without_lang
+
         feed.add(article.title or 'Unknow title',
-                 render_template("issue/feed_content.html", article=article),
+                 render_template(feed_template, article=article),
                  content_type='html',
                  author=article.authors,
                  id=article.doi or article.pid,
-                 url=url_external('main.article_detail',
-                                  url_seg=journal.url_segment,
-                                  url_seg_issue=issue.url_segment,
-                                  url_seg_article=article.url_segment,
-                                  lang_code=article_lang),
+                 url=url.replace(
+                     URL_SEG_ARTICLE_PLACEHOLDER,
+                     url_quote(article.url_segment, safe='/:')),
                  updated=journal.updated,
                  published=journal.created)
 
@@ -907,10 +1192,10 @@ def issue_feed(url_seg, url_seg_issue):
 @cache.cached(key_prefix=cache_key_with_lang)
 def article_detail_pid(pid):
 
-    article = controllers.get_article_by_pid(pid)
+    article = controllers.get_article_by_pid(pid, prefetch=True)
 
     if not article:
-        article = controllers.get_article_by_oap_pid(pid)
+        article = controllers.get_article_by_oap_pid(pid, prefetch=True)
 
     if not article:
         abort(404, _('Artigo não encontrado'))
@@ -927,32 +1212,45 @@ def render_html_from_xml(article, lang):
     else:
         result = fetch_data(article.xml)
 
-    xml = etree.parse(BytesIO(result))
+    xml = etree.ElementTree(etree.fromstring(result, parser=XML_PARSER))
+
+    generator = HTMLGenerator.parse(xml, valid_only=False, xslt=HTML_GENERATOR_XSLT)
+
+    # Fatiamos o HTML pelo div com id: standalonearticle, direto na árvore
+    # gerada, sem serializar e interpretar o documento completo novamente.
+    node = generator.generate(lang).find(".//*[@id='standalonearticle']")
 
-    generator = HTMLGenerator.parse(xml, valid_only=False)
+    if node is None:
+        return None, generator.languages
 
-    # Criamos um objeto do tip soup
-    soup = BeautifulSoup(etree.tostring(generator.generate(lang), encoding="UTF-8", method="html"), 'html.parser')
+    html = etree.tostring(node, encoding='unicode', method='html', with_tail=False)
 
-    # Fatiamos o HTML pelo div com class: articleTxt
-    return soup.find('div', {'id': 'standalonearticle'}), generator.languages
+    return html, generator.languages
+
+
+def _by_lang(items):
+    """Indexa pelo idioma (chave ``lang``) os itens de ``article.htmls``,
+    mantendo a ordem original e o primeiro item de cada idioma.
+    """
+    by_lang = OrderedDict()
+    for item in items or []:
+        by_lang.setdefault(item['lang'], item)
+    return by_lang
 
 
 def render_html_from_html(article, lang):
-    html_url = [html
-                for html in article.htmls
-                if html['lang'] == lang]
+    htmls_by_lang = _by_lang(article.htmls)
 
     try:
-        html_url = html_url[0]['url']
-    except IndexError:
+        html_url = htmls_by_lang[lang]['url']
+    except KeyError:
         raise ValueError('Artigo não encontrado') from None
 
     result = fetch_data(normalize_ssm_url(html_url))
 
     html = result.decode('utf8')
 
-    text_languages = [html['lang'] for html in article.htmls]
+    text_languages = list(htmls_by_lang)
 
     return html, text_languages
 
@@ -968,6 +1266,50 @@ def render_html(article, lang):
         return '', []
 
 
+def _get_article_by_url_segs(url_seg, url_seg_issue, url_seg_article, aop_fallback=False):
+    """
+    Retorna a tupla ``(article, issue)`` a partir dos segmentos de URL do
+    periódico, do número e do artigo, abortando com 404 caso o número ou o
+    artigo não existam.
+
+    Com ``aop_fallback`` o artigo não encontrado no número é buscado pelos
+    segmentos de URL de ahead of print.
+    """
+    article, issue, journal = controllers.get_article_detail_bundle(
+        url_seg, url_seg_issue, url_seg_article)
+
+    if not issue:
+        abort(404, _('Issue não encontrado'))
+
+    if not article and aop_fallback:
+        article = controllers.get_article_by_aop_url_segs(
+            journal, url_seg_issue, url_seg_article, prefetch=True
+        )
+    if not article:
+        abort(404, _('Artigo não encontrado'))
+
+    return article, issue
+
+
+def _is_article_language(article, lang_code):
+    """Indica se o artigo está disponível no idioma ``lang_code``."""
+    return lang_code == article.original_language or lang_code in article.languages
+
+
+def _redirect_to_original_lang(article, endpoint):
+    """Redireciona (301) para ``endpoint`` do artigo no idioma original."""
+    return redirect(
+        url_for(
+            endpoint,
+            url_seg=article.journal.url_segment,
+            url_seg_issue=article.issue.url_segment,
+            url_seg_article=article.url_segment,
+            lang_code=article.original_language
+        ),
+        code=301
+    )
+
+
 # TODO: Remover assim que o valor Article.xml estiver consistente na base de
 # dados
 def normalize_ssm_url(url):
@@ -981,11 +1323,18 @@ def normalize_ssm_url(url):
     Este código deve ser removido assim que o valor de Article.xml estiver
     consistente, i.e., todos os registros possuirem apenas URLs absolutas.
     """
+    return _normalize_ssm_url(current_app.config["SSM_BASE_URI"], url)
+
+
+@lru_cache(maxsize=4096)
+def _normalize_ssm_url(ssm_base_uri, url):
+    """Versão memorizada de ``normalize_ssm_url``, que recebe ``SSM_BASE_URI``
+    como argumento para ser função pura.
+    """
     if url.startswith("http"):
-        parsed_url = urlparse(url)
-        return current_app.config["SSM_BASE_URI"] + parsed_url.path
+        return ssm_base_uri + urlparse(url).path
     else:
-        return current_app.config["SSM_BASE_URI"] + url
+        return ssm_base_uri + url
 
 
 @main.route('/article/<string:url_seg>/<string:url_seg_issue>/<string:url_seg_article>/')
@@ -993,47 +1342,22 @@ def normalize_ssm_url(url):
 @main.route('/article/<string:url_seg>/<string:url_seg_issue>/<regex("(.*)"):url_seg_article>/')
 @main.route('/article/<string:url_seg>/<string:url_seg_issue>/<regex("(.*)"):url_seg_article>/<regex("(?:\w{2})"):lang_code>/')
 @cache.cached(key_prefix=cache_key_with_lang)
+@with_gzip_body
 def article_detail(url_seg, url_seg_issue, url_seg_article, lang_code=''):
-    issue = controllers.get_issue_by_url_seg(url_seg, url_seg_issue)
-
-    if not issue:
-        abort(404, _('Issue não encontrado'))
-
-    article = controllers.get_article_by_issue_article_seg(issue.iid, url_seg_article)
-
-    if not article:
-        article = controllers.get_article_by_aop_url_segs(
-            issue.journal, url_seg_issue, url_seg_article
-        )
-    if not article:
-        abort(404, _('Artigo não encontrado'))
+    article, issue = _get_article_by_url_segs(
+        url_seg, url_seg_issue, url_seg_article, aop_fallback=True)
 
     lang_code = lang_code or article.original_language
-    if lang_code not in article.languages + [article.original_language]:
+    if not _is_article_language(article, lang_code):
         # Se não é idioma válido, redireciona
-        return redirect(
-            url_for(
-                'main.article_detail',
-                url_seg=article.journal.url_segment,
-                url_seg_issue=article.issue.url_segment,
-                url_seg_article=article.url_segment,
-                lang_code=article.original_language
-            ),
-            code=301
-        )
+        return _redirect_to_original_lang(article, 'main.article_detail')
 
-    if not article.is_public:
-        abort(404, ARTICLE_UNPUBLISH + _(article.unpublish_reason))
+    _abort_if_article_unpublished(article)
 
-    if not article.issue.is_public:
-        abort(404, ISSUE_UNPUBLISH + _(article.issue.unpublish_reason))
+    articles = controllers.get_articles_by_iid(
+        issue.iid, is_public=True, only=NAVIGATION_ARTICLE_FIELDS)
 
-    if not article.journal.is_public:
-        abort(404, JOURNAL_UNPUBLISH + _(article.journal.unpublish_reason))
-
-    articles = controllers.get_articles_by_iid(issue.iid, is_public=True)
-
-    article_list = [_article for _article in articles]
+    article_list = list(articles)
 
     previous_article = utils.get_prev_article(article_list, article)
     next_article = utils.get_next_article(article_list, article)
@@ -1042,14 +1366,7 @@ def article_detail(url_seg, url_seg_issue, url_seg_article, lang_code=''):
 
     if article.pdfs:
         try:
-            pdf_urls = [pdf['url'] for pdf in article.pdfs]
-
-            if not pdf_urls:
-                abort(404, _('PDF do Artigo não encontrado'))
-            else:
-                pdf_urls_parsed = list(map(urlparse, pdf_urls))
-                pdf_urls_path = [pdf.path for pdf in pdf_urls_parsed]
-
+            pdf_urls_path = [urlparse(pdf['url']).path for pdf in article.pdfs]
         except Exception:
             abort(404, _('PDF do Artigo não encontrado'))
 
@@ -1058,22 +1375,22 @@ def article_detail(url_seg, url_seg_issue, url_seg_article, lang_code=''):
     except (ValueError, NonRetryableError, RetryableError):
         abort(404, _('HTML do Artigo não encontrado ou indisponível'))
 
-    text_versions = sorted(
-           [
-               (
-                   lang,
-                   display_original_lang_name(lang),
-                   url_for(
-                      'main.article_detail',
-                      url_seg=article.journal.url_segment,
-                      url_seg_issue=article.issue.url_segment,
-                      url_seg_article=article.url_segment,
-                      lang_code=lang
-                   )
-               )
-               for lang in text_languages
-           ]
-       )
+    text_version_url = url_for(
+        'main.article_detail',
+        url_seg=article.journal.url_segment,
+        url_seg_issue=article.issue.url_segment,
+        url_seg_article=article.url_segment,
+        lang_code=LANG_CODE_PLACEHOLDER
+    )
+    # os idiomas são ordenados e sem repetição antes de montar as versões
+    text_versions = [
+        (
+            lang,
+            display_original_lang_name(lang),
+            text_version_url.replace(LANG_CODE_PLACEHOLDER, lang)
+        )
+        for lang in sorted(set(text_languages))
+    ]
     context = {
         'next_article': next_article,
         'previous_article': previous_article,
@@ -1095,10 +1412,10 @@ def article_detail(url_seg, url_seg_issue, url_seg_article, lang_code=''):
 @main.route('/readcube/epdf.php')
 @cache.cached(key_prefix=cache_key_with_lang_with_qs)
 def article_epdf():
-    doi = request.args.get('doi', None, type=str)
-    pid = request.args.get('pid', None, type=str)
-    pdf_path = request.args.get('pdf_path', None, type=str)
-    lang = request.args.get('lang', None, type=str)
+    doi = request.args.get('doi')
+    pid = request.args.get('pid')
+    pdf_path = request.args.get('pdf_path')
+    lang = request.args.get('lang')
 
     if not all([doi, pid, pdf_path, lang]):
         abort(400, _('Parâmetros insuficientes para obter o EPDF do artigo'))
@@ -1119,12 +1436,35 @@ def get_content_from_ssm(resource_ssm_media_path):
     url = resource_ssm_full_url.strip()
     mimetype, __ = mimetypes.guess_type(url)
 
+    if current_app.config['CACHE_ENABLED'] or mimetype == 'text/html':
+        # a resposta é armazenada no cache, portanto o conteúdo é lido por
+        # completo; o HTML também, pois é minificado (HTMLMIN) por inteiro
+        try:
+            ssm_response = fetch_data(url)
+        except (NonRetryableError, RetryableError):
+            abort(404, _('Recruso não encontrado'))
+        else:
+            return Response(ssm_response, mimetype=mimetype)
+
+    # sem cache, o conteúdo é repassado ao cliente em partes, sem manter o
+    # arquivo inteiro em memória
     try:
-        ssm_response = fetch_data(url)
+        ssm_response = fetch_data_stream(url)
     except (NonRetryableError, RetryableError):
         abort(404, _('Recruso não encontrado'))
     else:
-        return Response(ssm_response, mimetype=mimetype)
+        # o Content-Length do SSM só é válido se o conteúdo não veio
+        # comprimido (apesar do ``Accept-Encoding: identity``); nesse caso o
+        # conteúdo é descomprimido antes de ser repassado
+        headers = {}
+        if ('Content-Length' in ssm_response.headers and
+                'Content-Encoding' not in ssm_response.headers):
+            headers['Content-Length'] = ssm_response.headers['Content-Length']
+        body = ClosingIterator(
+            ssm_response.raw.stream(SSM_STREAM_CHUNK_SIZE, decode_content=True),
+            [ssm_response.close])
+        return Response(body, mimetype=mimetype, headers=headers,
+                        direct_passthrough=True)
 
 
 @main.route('/media/assets/<regex("(.*)"):relative_media_path>')
@@ -1139,7 +1479,7 @@ def media_assets_proxy(relative_media_path):
 @main.route('/article/ssm/content/raw/')
 @cache.cached(key_prefix=cache_key_with_lang_with_qs)
 def article_ssm_content_raw():
-    resource_ssm_path = request.args.get('resource_ssm_path', None)
+    resource_ssm_path = request.args.get('resource_ssm_path')
     if not resource_ssm_path:
         raise abort(404, _('Recurso do Artigo não encontrado. Caminho inválido!'))
     else:
@@ -1152,58 +1492,27 @@ def article_ssm_content_raw():
 @main.route('/pdf/<string:url_seg>/<string:url_seg_issue>/<regex("(.*)"):url_seg_article>/<regex("(?:\w{2})"):lang_code>')
 @cache.cached(key_prefix=cache_key_with_lang)
 def article_detail_pdf(url_seg, url_seg_issue, url_seg_article, lang_code=''):
-    issue = controllers.get_issue_by_url_seg(url_seg, url_seg_issue)
-
-    if not issue:
-        abort(404, _('Issue não encontrado'))
-
-    article = controllers.get_article_by_issue_article_seg(issue.iid, url_seg_article)
-
-    if not article:
-        abort(404, _('Artigo não encontrado'))
+    article, issue = _get_article_by_url_segs(
+        url_seg, url_seg_issue, url_seg_article)
 
     lang_code = lang_code or article.original_language
-    if lang_code not in article.languages + [article.original_language]:
+    if not _is_article_language(article, lang_code):
         # Se não é idioma válido, redireciona
-        return redirect(
-            url_for(
-                'main.article_detail_pdf',
-                url_seg=article.journal.url_segment,
-                url_seg_issue=article.issue.url_segment,
-                url_seg_article=article.url_segment,
-                lang_code=article.original_language
-            ),
-            code=301
-        )
-
-    if not article.is_public:
-        abort(404, ARTICLE_UNPUBLISH + _(article.unpublish_reason))
-
-    if not article.issue.is_public:
-        abort(404, ISSUE_UNPUBLISH + _(article.issue.unpublish_reason))
-
-    if not article.journal.is_public:
-        abort(404, JOURNAL_UNPUBLISH + _(article.journal.unpublish_reason))
-
-    pdf_ssm_path = None
-
-    if article.pdfs:
-        try:
-            pdf_url = [pdf for pdf in article.pdfs if pdf['lang'] == lang_code]
+        return _redirect_to_original_lang(article, 'main.article_detail_pdf')
 
-            if len(pdf_url) != 1:
-                abort(404, _('PDF do Artigo não encontrado'))
-            else:
-                pdf_url = pdf_url[0]['url']
+    _abort_if_article_unpublished(article)
 
-            pdf_url_parsed = urlparse(pdf_url)
-            pdf_ssm_path = pdf_url_parsed.path
+    try:
+        pdf_url = next((pdf['url'] for pdf in article.pdfs or []
+                        if pdf['lang'] == lang_code), None)
+    except KeyError:
+        abort(404, _('PDF do Artigo não encontrado'))
 
-        except Exception:
-            abort(404, _('PDF do Artigo não encontrado'))
-    else:
+    if not pdf_url:
         abort(404, _('PDF do Artigo não encontrado'))
 
+    pdf_ssm_path = urlparse(pdf_url).path
+
     if not pdf_ssm_path:
         raise abort(404, _('Recurso do Artigo não encontrado. Caminho inválido!'))
     else:
@@ -1225,13 +1534,13 @@ def router_legacy_pdf(journal_acron, issue_info, pdf_filename):
 @main.route('/cgi-bin/fbpe/<string:text_or_abstract>/')
 @cache.cached(key_prefix=cache_key_with_lang_with_qs)
 def router_legacy_article(text_or_abstract):
-    pid = request.args.get('pid', None)
-    lng = request.args.get('lng', None)
-    if not (text_or_abstract in ['fbtext', 'fbabs'] and pid):
+    pid = request.args.get('pid')
+    lng = request.args.get('lng')
+    if not (text_or_abstract in LEGACY_ARTICLE_PAGES and pid):
         # se tem pid
         abort(400, _('Requsição inválida ao tentar acessar o artigo com pid: %s' % pid))
 
-    article = controllers.get_article_by_scielo_pid(pid, is_public=True)
+    article = controllers.get_article_by_scielo_pid(pid, prefetch=True, is_public=True)
     if not article:
         abort(404, _('Artigo não encontrado'))
 
@@ -1259,7 +1568,7 @@ def router_legacy_article(text_or_abstract):
 @main.route("/email_share_ajax/", methods=['POST'])
 def email_share_ajax():
 
-    if not request.is_xhr:
+    if not _is_ajax_request():
         abort(400, _('Requisição inválida.'))
 
     form = forms.EmailShareForm(request.form)
@@ -1290,7 +1599,7 @@ def email_form():
 @main.route("/email_error_ajax/", methods=['POST'])
 def email_error_ajax():
 
-    if not request.is_xhr:
+    if not _is_ajax_request():
         abort(400, _('Requisição inválida.'))
 
     form = forms.ErrorForm(request.form)
@@ -1325,28 +1634,30 @@ def error_form():
 
 
 @main.route("/media/<path:filename>/", methods=['GET'])
-@cache.cached(key_prefix=cache_key_with_lang)
 def download_file_by_filename(filename):
     media_root = current_app.config['MEDIA_ROOT']
-    return send_from_directory(media_root, filename)
+    return send_from_directory(media_root, filename, conditional=True)
 
 
 @main.route("/img/scielo.gif", methods=['GET'])
 def full_text_image():
-    return send_from_directory('static', 'img/full_text_scielo_img.gif')
+    return send_from_directory('static', 'img/full_text_scielo_img.gif',
+                               conditional=True, cache_timeout=STATIC_FILE_MAX_AGE)
 
 
 @main.route("/robots.txt", methods=['GET'])
 def get_robots_txt_file():
-    return send_from_directory('static', 'robots.txt')
+    return send_from_directory('static', 'robots.txt',
+                               conditional=True, cache_timeout=STATIC_FILE_MAX_AGE)
 
 
 @main.route("/revistas/<path:journal_seg>/<string:page>.htm", methods=['GET'])
+@cache.cached(key_prefix=cache_key_with_lang)
 def router_legacy_info_pages(journal_seg, page):
     """
     Essa view function realiza o redirecionamento das URLs antigas para as novas URLs.
 
-    Mantém um dicionário como uma tabela relacionamento entre o nome das páginas que pode ser:
+    Usa o dicionário ``LEGACY_PAGE_ANCHORS`` como uma tabela relacionamento entre o nome das páginas que pode ser:
 
        Página      âncora
 
@@ -1355,17 +1666,5 @@ def router_legacy_info_pages(journal_seg, page):
     [iinstruc.htm einstruc.htm, pinstruc.htm]-> #instructions
     isubscrp.htm -> Sem âncora
     """
-
-    page_anchor = {
-        'iaboutj': '#about',
-        'eaboutj': '#about',
-        'paboutj': '#about',
-        'eedboard': '#editors',
-        'iedboard': '#editors',
-        'pedboard': '#editors',
-        'iinstruc': '#instructions',
-        'pinstruc': '#instructions',
-        'einstruc': '#instructions'
-        }
     return redirect('%s%s' % (url_for('main.about_journal',
-                                      url_seg=journal_seg), page_anchor.get(page, '')), code=301)
+                                      url_seg=journal_seg), LEGACY_PAGE_ANCHORS.get(page, '')), code=301)
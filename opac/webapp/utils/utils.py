@@ -71,6 +71,16 @@ def get_timed_serializer():
     return URLSafeTimedSerializer(current_app.config["SECRET_KEY"])
 
 
+def _article_index(articles, article):
+    """
+    Retorna o índice do ``article`` na lista ``articles`` comparando pela
+    chave primária, ou None caso o artigo não esteja na lista.
+    """
+    return next(
+        (i for i, _article in enumerate(articles) if _article.pk == article.pk),
+        None)
+
+
 def get_prev_article(articles, article):
     """
     Considerando que a lista de artigos está ordenada pelo atributo ``order``,
@@ -78,19 +88,19 @@ def get_prev_article(articles, article):
     valor no atributo ``order``. A lógica é direta ou seja para retornar o
     artigo anterior subtrai 1 do índice corrente.
 
+    A lista pode conter artigos carregados parcialmente (projeção), basta
+    que tenham a chave primária.
+
     IMPORTANTE: Quando o índice do artigo for igual a 0 devemos retornar None.
 
     """
-    if len(articles) != 0:
-        try:
-            if articles.index(article) == 0:
-                return None
-            return articles[articles.index(article) - 1]
-        except IndexError:
-            return None
-    else:
+    idx = _article_index(articles, article)
+
+    if idx is None or idx == 0:
         return None
 
+    return articles[idx - 1]
+
 
 def get_next_article(articles, article):
     """
@@ -99,20 +109,29 @@ def get_next_article(articles, article):
     valor no atributo ``order``. A lógica é direta ou seja para retornar o
     próximo artigo soma 1 ao índice corrente.
 
+    A lista pode conter artigos carregados parcialmente (projeção), basta
+    que tenham a chave primária.
 
     IMPORTANTE: Quando o índice do artigo for igual ao tamanho da lista
     devemos retornar None.
     """
-    if len(articles) != 0:
-        try:
-            if len(articles) == articles.index(article):
-                return None
-            return articles[articles.index(article) + 1]
-        except IndexError:
-            return None
-    else:
+    idx = _article_index(articles, article)
+
+    if idx is None or idx + 1 >= len(articles):
         return None
 
+    return articles[idx + 1]
+
+
+def _issue_index(issues, issue):
+    """
+    Retorna o índice do ``issue`` na lista ``issues`` comparando pelo ``iid``,
+    ou None caso o número não esteja na lista.
+    """
+    return next(
+        (i for i, _issue in enumerate(issues) if _issue.iid == issue.iid),
+        None)
+
 
 def get_prev_issue(issues, issue):
     """
@@ -128,14 +147,16 @@ def get_prev_issue(issues, issue):
     IMPORTANTE: A lista de números deve ter mais do que 1 item para que
     possa existir a ideia de anterior e próximo
     """
-    if len(issues) >= 2:
-        try:
-            return issues[issues.index(issue) + 1]
-        except IndexError:
-            return None
-    else:
+    if len(issues) < 2:
+        return None
+
+    idx = _issue_index(issues, issue)
+
+    if idx is None or idx + 1 >= len(issues):
         return None
 
+    return issues[idx + 1]
+
 
 def get_next_issue(issues, issue):
     """
@@ -152,17 +173,17 @@ def get_next_issue(issues, issue):
     possa existir a ideia de anterior e próximo
     """
 
-    if len(issues) >= 2:
-        try:
-            # Caso o número seja o primeiro retorna None
-            if issues.index(issue) == 0:
-                return None
-            return issues[issues.index(issue) - 1]
-        except IndexError:
-            return None
-    else:
+    if len(issues) < 2:
+        return None
+
+    idx = _issue_index(issues, issue)
+
+    # Caso o número seja o primeiro retorna None
+    if idx is None or idx == 0:
         return None
 
+    return issues[idx - 1]
+
 
 def get_label_issue(issue):
     label = 'Vol. %s ' % issue.volume if issue.volume else ''